@@ -14,6 +14,7 @@ class LHCCollision(Scene):
         # ==========================================
         # PART 1: THE THEORY (THE HIGGS FIELD) (~15s)
         # ==========================================
+        self.next_section("part1_theory")
         
         # Grid representing the field
         # Create a grid of small dots
@@ -78,6 +79,7 @@ class LHCCollision(Scene):
         # ==========================================
         # PART 2: THE MACHINE (ACCELERATOR) (~25s)
         # ==========================================
+        self.next_section("part2_machine")
         
         # Geometry
         lhc_radius = 2.5
@@ -164,6 +166,7 @@ class LHCCollision(Scene):
         # ==========================================
         # PART 3: THE COLLISION (~10s)
         # ==========================================
+        self.next_section("part3_collision")
         
         self.play(FadeOut(info_text), FadeOut(beams_text), FadeOut(lhc_bold), FadeOut(lhc_label), FadeOut(lhc_dates), FadeOut(lhc_ring))
         
@@ -242,6 +245,7 @@ class LHCCollision(Scene):
         # ==========================================
         # PART 4: THE RESULT (~10s)
         # ==========================================
+        self.next_section("part4_result")
         
         # Prepare Plot (but don't show yet)
         ax = Axes(
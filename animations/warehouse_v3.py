@@ -7,6 +7,7 @@ import numpy as np
 class WarehouseOptimizationV3(MovingCameraScene):
     def construct(self):
         # 1. Build Map
+        self.next_section("build_map")
         self.map_builder = MapBuilder("assets/ontario.geojson")
         ontario_map = self.map_builder.build_map_mobjects(
             fill_color="#1a1a1a", 
@@ -15,6 +16,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         self.add(ontario_map)
         
         # 2. Setup Camera (Southern Ontario focus)
+        self.next_section("camera")
         # Bounding box roughly covers Windsor (-83) to Ottawa (-75)
         # Calculate center point in Manim coordinates
         center_point = self.map_builder.lat_lon_to_point(43.8, -79.5)
@@ -23,6 +25,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         self.camera.frame.set(width=8.0) 
         
         # 3. Visualization Setup
+        self.next_section("visualization_setup")
         zones = VGroup()
         candidates = VGroup()
         
@@ -67,6 +70,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         self.wait(1)
         
         # 4. Optimization Info Overlay
+        self.next_section("info_overlay")
         info_box = VGroup(
             Text("Network Optimization", font_size=36, color=WHITE),
             Text("Objective: Minimize Fixed + Transport Costs", font_size=24, color=GREY_A),
@@ -84,6 +88,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         self.wait(2)
         
         # 5. Run Optimization (Visual Effect)
+        self.next_section("run_optimization")
         # Flash connections to candidates randomly to simulate "solving"
         
         # Create a few temporary lines
@@ -105,6 +110,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         )
         
         # 6. Reveal Solution
+        self.next_section("reveal_solution")
         
         # Identify Optimal vs Rejected
         optimal_mobjects = VGroup()
@@ -139,6 +145,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         self.wait(1)
         
         # 7. Assignment Lines
+        self.next_section("assignment_lines")
         # Draw lines from every zone to closest OPTIMAL warehouse
         assignment_lines = VGroup()
         
@@ -176,6 +183,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         self.wait(2)
         
         # 8. Service Level Badge
+        self.next_section("service_level")
         badge = VGroup(
             RoundedRectangle(corner_radius=0.1, color=GREEN, fill_opacity=0.2, width=3, height=1),
             Text("Service Level: 100%", font_size=24, color=WHITE)
@@ -185,6 +193,7 @@ class WarehouseOptimizationV3(MovingCameraScene):
         self.wait(2)
         
         # 9. Final Zoom Out
+        self.next_section("zoom_out")
         zoom_out_center = self.map_builder.lat_lon_to_point(44, -79)
         self.play(
             self.camera.frame.animate.set(width=12).move_to(zoom_out_center),
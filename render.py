@@ -1,18 +1,37 @@
 import subprocess
 import os
 import sys
+import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rendering import daemon as render_daemon
+from rendering import profiling
+from rendering.audio import add_audio
+from rendering.cache import RenderCache, input_hash
+from rendering.deliverables import PROFILES, transcode
+from rendering.discovery import SCENE_ROOTS, SceneIndex, print_scenes
+from rendering.jobs import JobQueue, print_status
+from rendering.keyframes import keyframes_command
+from rendering.manifest import Manifest
+from rendering.metadata import read_sidecar
+from rendering.quality import QUALITIES, module_name, video_path
+from rendering.renderers import RENDERERS
+from rendering.sections import evict_sections, render_sections
+from rendering.segments import render_segmented
+from rendering.streaming import playlist_path, stream_dir
 
 def get_video_duration(video_path):
     """Get video duration in seconds using ffprobe."""
     cmd = [
-        "ffprobe", 
-        "-v", "error", 
-        "-show_entries", "format=duration", 
-        "-of", "default=noprint_wrappers=1:nokey=1", 
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
         video_path
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    with profiling.phase("ffprobe", children=True):
+        result = subprocess.run(cmd, capture_output=True, text=True)
     try:
         if result.returncode != 0:
             return None
@@ -20,82 +39,254 @@ def get_video_duration(video_path):
     except ValueError:
         return None
 
-def find_latest_video(scene_name, quality="480p15"):
-    """Finds the rendered video file. Manim directory structure can be complex."""
-    # Common Manim output structure: media/videos/<module_name>/<quality>/<scene_name>.mp4
-    # We might need to search recursively if the path isn't obvious
-    base_dir = os.path.join("media", "videos")
-    
-    # Try the standard path first: media/videos/<module_name>/<quality>/<scene_name>.mp4
-    # But module name depends on input file.
-    # Let's search for the scene file name in media/videos
-    
-    search_name = f"{scene_name}.mp4"
-    for root, dirs, files in os.walk(base_dir):
-        if search_name in files:
-             # Check if it matches the quality folder if possible, or just take the first found
-             if quality in root:
-                 return os.path.join(root, search_name)
-    
-    return None
+def record_render(file, scene, quality, input_hash=None, manifest=None, path=None):
+    """Add a finished Manim render to the manifest. Returns the entry, or None if
+    Manim did not write the video."""
+    # Manim's layout is fixed: media/videos/<module>/<height>p<fps>/<Scene>.mp4
+    path = path or video_path(file, scene, quality)
+    if not os.path.exists(path):
+        return None
 
-def main():
-    parser = argparse.ArgumentParser(description="Render Manim scene with audio post-processing.")
-    parser.add_argument("file", help="Path to the python file containing the Scene")
-    parser.add_argument("scene", help="Name of the Scene class to render")
-    parser.add_argument("--quality", "-q", default="l", choices=["l", "m", "h", "k"], 
-                        help="Render quality (l=480p15, m=720p30, h=1080p60, k=2160p60)")
-    parser.add_argument("--preview", "-p", action="store_true", help="Preview (open) file after render")
-    parser.add_argument("--audio", "-a", help="Path to audio file", default="assets/ambient.mp3")
-    
-    args = parser.parse_args()
+    # The runner leaves a metadata sidecar, so only probe videos without one
+    metadata = read_sidecar(path)
+    if metadata:
+        fields = {key: metadata[key] for key in ("duration", "frame_count", "width", "height")}
+    else:
+        fields = {"duration": get_video_duration(path)}
 
-    # Map quality to Manim flags and folder names
-    quality_map = {
-        "l": "-pql", 
-        "m": "-pqm", 
-        "h": "-pqh", 
-        "k": "-pqk"
-    }
-    
-    # Run Manim Render
-    print(f"🎥 Rendering {args.scene} from {args.file}...")
-    manim_cmd = ["uv", "run", "manim", quality_map[args.quality], args.file, args.scene]
-    
-    if args.preview:
-        # We handle preview manually after audio mix, so don't pass -p to manim?
-        # Manim's -p will open the silent version. Let's let Manim do its thing?
-        # Actually, user wants to see the FINAL version.
-        pass
-
-    subprocess.run(manim_cmd, check=True)
-
-    # Find the output video
-    # Manim quality folder names: 480p15, 720p30, 1080p60, 2160p60
-    # This is a simplification; framerate depends on config.
-    # We will search for the file.
-    
-    input_video = find_latest_video(args.scene)
-    
-    if not input_video:
-        print(f"❌ Error: Could not find rendered video for {args.scene}")
-        return
+    return (manifest or Manifest()).update(
+        module_name(file), scene, quality,
+        fps=QUALITIES[quality]["fps"],
+        path=path,
+        input_hash=input_hash,
+        **fields
+    )
+
+def find_scenes(path):
+    """List (file, scene) pairs for every Scene subclass in a file or package directory."""
+    return [(scene["file"], scene["name"]) for scene in SceneIndex().scenes(path)]
+
+def open_file(path):
+    """Open a file with the platform viewer."""
+    if sys.platform == "darwin":
+        subprocess.run(["open", path])
+
+def run_logged(cmd, log_path=None):
+    """Run a render command, sending its output to log_path if given."""
+    if log_path:
+        # Batch renders run side by side, so keep each scene's Manim output apart
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with open(log_path, "w") as log:
+            subprocess.run(cmd, check=True, stdout=log, stderr=subprocess.STDOUT)
+    else:
+        subprocess.run(cmd, check=True)
+
+def render_scene(file, scene, quality="l", audio="assets/ambient.mp3", preview=False, log_path=None, cache=None,
+                 single_pass=False, segments=1, profile=False, profile_python=False, daemon=False, deliver=None,
+                 sections=False, stream=False, renderer="cairo", frame_workers=None, memory_audit=False,
+                 range_workers=None, instrument=False):
+    """Render one scene with Manim and mux the audio track. Returns the output path.
+
+    With daemon, the render runs on the warm render daemon (see
+    rendering.daemon) instead of a fresh `uv run` process.
+
+    With sections, only the scene's sections whose plays changed are
+    rendered again (see rendering.sections).
+
+    range_workers caps the runners that segments or sections start at once
+    (default: one per core).
+
+    With stream, the runner also writes a progressive HLS playlist under
+    media/streams that can be played while the render is running.
+
+    renderer picks Manim's renderer; "opengl" also works headless through
+    EGL and Mesa's software rasterizer (see rendering.renderers).
+
+    frame_workers rasterizes the frames of long plays on that many processes
+    (0: one per core; see rendering.parallel).
+
+    With memory_audit, the runner spills the pixels of images removed from
+    the scene to disk and reports live mobject memory per section to
+    media/memory (see rendering.memory).
+
+    With instrument, the runner logs the timing and mobject counts of every
+    play to media/instrumentation (see rendering.instrumentation).
+
+    With deliver, a list of rendering.deliverables profiles, every format is
+    then encoded from one decode of the finished video.
+
+    With profile, per-phase telemetry is written to media/profiles and appended
+    to the history file; profile_python also dumps a cProfile of the render.
+    """
+    if not profile:
+        output = _render_scene(file, scene, quality, audio, preview, log_path, cache, single_pass, segments,
+                               daemon=daemon, sections=sections, stream=stream, renderer=renderer,
+                               frame_workers=frame_workers, memory_audit=memory_audit,
+                               range_workers=range_workers, instrument=instrument)
+        return deliver_scene(file, scene, quality, audio, output, deliver)
+
+    recorder = profiling.start()
+    try:
+        with profiling.phase("total"):
+            output = _render_scene(
+                file, scene, quality, audio, preview, log_path, cache, single_pass, segments, profile_python,
+                daemon, sections, stream, renderer, frame_workers, memory_audit, range_workers, instrument
+            )
+            output = deliver_scene(file, scene, quality, audio, output, deliver)
+    finally:
+        profiling.stop()
+    report_path = profiling.write_report(scene, quality, recorder)
+    print(f"📊 Profile saved to {report_path}")
+    return output
+
+def _render_scene(file, scene, quality, audio, preview, log_path, cache, single_pass, segments, profile_python=False,
+                  daemon=False, sections=False, stream=False, renderer="cairo", frame_workers=None,
+                  memory_audit=False, range_workers=None, instrument=False):
+    manifest = Manifest()
+    with profiling.phase("input hash"):
+        key = input_hash(file, scene, quality, audio, renderer)
+
+    # Skip Manim, ffprobe and ffmpeg entirely when none of the inputs changed
+    if cache is not None:
+        cached = cache.get(key)
+        if cached:
+            print(f"⚡ Cache hit for {scene}: {cached}")
+            if preview:
+                open_file(cached)
+            return cached
+
+    has_audio = os.path.exists(audio)
+    if not has_audio:
+        print(f"⚠️ Warning: Audio file not found at {audio}. Skipping audio processing.")
+
+    if single_pass and segments > 1:
+        print("⚠️ Warning: --single-pass does not combine with --segments. Muxing audio afterwards.")
+        single_pass = False
+    if sections and segments > 1:
+        print("⚠️ Warning: --sections already renders changed sections in parallel. Ignoring --segments.")
+        segments = 1
+    if single_pass and sections:
+        print("⚠️ Warning: --single-pass does not combine with --sections. Muxing audio afterwards.")
+        single_pass = False
+
+    if renderer != "cairo" and (segments > 1 or sections or daemon):
+        print(f"⚠️ Warning: --renderer {renderer} renders in one runner. Ignoring --segments, --sections and --daemon.")
+        segments, sections, daemon = 1, False, False
+
+    if stream and (segments > 1 or sections or daemon):
+        print("⚠️ Warning: --stream needs one runner for the whole scene. Ignoring --segments, --sections and --daemon.")
+        segments, sections, daemon = 1, False, False
+
+    if daemon:
+        if segments > 1 or sections:
+            print("⚠️ Warning: The render daemon renders whole scenes. Ignoring --segments and --sections.")
+            segments, sections = 1, False
+        # The daemon always muxes the audio while it writes the video
+        single_pass = True
+
+    if frame_workers is not None and (renderer != "cairo" or segments > 1 or sections or daemon):
+        print("⚠️ Warning: --frame-workers needs one Cairo runner for the whole scene. Ignoring it.")
+        frame_workers = None
+
+    if memory_audit and (segments > 1 or sections or daemon):
+        print("⚠️ Warning: --memory-audit needs one runner for the whole scene. Ignoring it.")
+        memory_audit = False
+
+    if instrument and (segments > 1 or sections or daemon):
+        print("⚠️ Warning: --instrument needs one runner for the whole scene. Ignoring it.")
+        instrument = False
+
+    # The runner renders like the manim CLI, and also writes the metadata
+    # sidecar, muxes the audio in the same pass and reports Manim's phases.
+    runner_cmd = ["uv", "run", "python", "-m", "rendering.runner", file, scene, "--quality", quality,
+                  "--renderer", renderer]
+    runner_profile = None
+    if profiling.active():
+        os.makedirs(profiling.PROFILE_DIR, exist_ok=True)
+        runner_profile = os.path.join(profiling.PROFILE_DIR, f"{scene}_{quality}.runner.json")
+        runner_cmd += ["--profile", runner_profile]
+        if profile_python:
+            runner_cmd += ["--profile-python", os.path.join(profiling.PROFILE_DIR, f"{scene}_{quality}.prof")]
+    if frame_workers is not None:
+        runner_cmd += ["--frame-workers", str(frame_workers)]
+    if memory_audit:
+        runner_cmd.append("--memory-audit")
+    if instrument:
+        runner_cmd.append("--instrument")
+    if stream:
+        directory = stream_dir(scene)
+        runner_cmd += ["--stream", directory]
+        if has_audio:
+            runner_cmd += ["--stream-audio", audio]
+            # The new duration is only known at the end; the last one is usually close
+            previous = manifest.lookup(module_name(file), scene, quality)
+            if previous and previous.get("duration"):
+                runner_cmd += ["--stream-duration", str(previous["duration"])]
+        print(f"📡 Streaming to {playlist_path(directory)} as the render runs")
+
+    print(f"🎥 Rendering {scene} from {file}...")
+    if daemon:
+        try:
+            with profiling.phase("daemon render"):
+                render_daemon.submit(file, scene, quality, audio if has_audio else None)
+        except render_daemon.DaemonError as e:
+            print(f"❌ Error: {e}")
+            return None
+        runner_profile = None
+    elif sections:
+        with profiling.phase("sections", children=True):
+            render_sections(file, scene, quality, log_path, workers=range_workers)
+        if cache is not None and cache.max_age is not None:
+            evict_sections(cache.max_age)
+        runner_profile = None
+    elif segments > 1:
+        with profiling.phase("segments", children=True):
+            render_segmented(file, scene, quality, segments, log_path, range_workers)
+        runner_profile = None
+    elif single_pass and has_audio:
+        # The runner muxes the music bed while concatenating the partial
+        # movies, so the finished file is written once and never re-read.
+        with profiling.phase("manim subprocess", children=True):
+            run_logged(runner_cmd + ["--audio", audio], log_path)
+    else:
+        with profiling.phase("manim subprocess", children=True):
+            run_logged(runner_cmd, log_path)
+
+    if runner_profile:
+        with open(runner_profile, "r") as f:
+            profiling.merge_phases(json.load(f), prefix="manim/")
+        os.remove(runner_profile)
+
+    if single_pass and has_audio:
+        silent_path = video_path(file, scene, quality)
+        output_video = os.path.splitext(silent_path)[0] + "_Audio.mp4"
+        entry = record_render(file, scene, quality, key, manifest, path=output_video)
+        if not entry:
+            print(f"❌ Error: Could not find rendered video for {scene}")
+            return None
+        manifest.update(module_name(file), scene, quality, audio_path=output_video)
+        print(f"✅ Success! Output saved to: {output_video}")
+        return finish_render(output_video, key, scene, cache, preview)
+
+    # Index the output video
+    entry = record_render(file, scene, quality, key, manifest)
 
+    if not entry:
+        print(f"❌ Error: Could not find rendered video for {scene}")
+        return None
+
+    input_video = entry["path"]
     print(f"Found input video: {input_video}")
 
-    # Check Audio
-    if not os.path.exists(args.audio):
-        print(f"⚠️ Warning: Audio file not found at {args.audio}. Skipping audio processing.")
-        if args.preview:
-             if sys.platform == "darwin": subprocess.run(["open", input_video])
-        return
+    if not has_audio:
+        return finish_render(input_video, key, scene, cache, preview)
 
     # Get Duration
-    duration = get_video_duration(input_video)
+    duration = entry["duration"]
     if duration is None:
         print("❌ Error: Could not determine video duration.")
-        return
-    
+        return None
+
     print(f"⏱️ Video Duration: {duration} seconds")
 
     # Output filename
@@ -103,32 +294,249 @@ def main():
     base_name = os.path.splitext(os.path.basename(input_video))[0]
     output_video = os.path.join(video_dir, f"{base_name}_Audio.mp4")
 
-    # Fade out settings
-    fade_duration = 2
-    fade_start = max(0, duration - fade_duration)
-    
     print("🎵 Adding audio with fade out...")
-    
-    ffmpeg_cmd = [
-        "ffmpeg", "-y", "-v", "error",
-        "-i", input_video,
-        "-i", args.audio,
-        "-map", "0:v",
-        "-map", "1:a",
-        "-c:v", "copy",
-        "-af", f"afade=t=out:st={fade_start}:d={fade_duration}",
-        "-shortest",
-        output_video
-    ]
-    
-    subprocess.run(ffmpeg_cmd, check=True)
-    
+    with profiling.phase("ffmpeg mux", children=True):
+        add_audio(input_video, audio, output_video, duration, fps=QUALITIES[quality]["fps"])
+
     print(f"✅ Success! Output saved to: {output_video}")
-    
+
+    manifest.update(module_name(file), scene, quality, audio_path=output_video)
+    return finish_render(output_video, key, scene, cache, preview)
+
+def deliver_scene(file, scene, quality, audio, output, profiles=None):
+    """Encode the deliverable profiles of a rendered scene. Returns output unchanged."""
+    if not output or not profiles:
+        return output
+
+    # Prefer the silent master plus the original music, so the audio is only
+    # encoded once more; fall back to the finished video's own track.
+    master, music, duration = output, None, None
+    entry = Manifest().lookup(module_name(file), scene, quality)
+    if entry and audio and os.path.exists(audio):
+        silent = entry["path"]
+        if silent != output and os.path.exists(silent) and os.path.getmtime(silent) <= os.path.getmtime(output):
+            master, music, duration = silent, audio, entry["duration"]
+
+    print(f"📦 Encoding {', '.join(profiles)} from {master}...")
+    with profiling.phase("deliverables", children=True):
+        outputs = transcode(master, scene, profiles, music, duration)
+    for path in outputs.values():
+        print(f"   {path}")
+    return output
+
+def finish_render(output_video, key, scene, cache=None, preview=False):
+    """Store a finished render in the cache and open it if preview was requested."""
+    if cache is not None:
+        cache.put(key, output_video, scene)
+
     # Open the file if preview requested
-    if args.preview:
-        if sys.platform == "darwin":
-            subprocess.run(["open", output_video])
+    if preview:
+        open_file(output_video)
+
+    return output_video
+
+def render_batch(jobs, workers=None, **options):
+    """Render several (file, scene) jobs at once on a process pool.
+
+    Each worker runs the Manim render and then the audio mux for its scene, so
+    a scene's audio step starts as soon as its own render is done. options are
+    passed on to render_scene. Returns the output video of every job, or None
+    if it failed, keyed by (file, scene, quality): scenes in different files
+    may share a name.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    print(f"🚀 Rendering {len(jobs)} scenes on {workers} workers...")
+    # Segmented and sectioned scenes share the cores with the other workers
+    options.setdefault("range_workers", max(1, (os.cpu_count() or 1) // workers))
+    quality = options.get("quality", "l")
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for file, scene in jobs:
+            log_path = os.path.join("media", "logs", f"{module_name(file)}_{scene}.log")
+            future = pool.submit(render_scene, file, scene, log_path=log_path, **options)
+            futures[future] = (file, scene, log_path)
+
+        for future in as_completed(futures):
+            file, scene, log_path = futures[future]
+            try:
+                results[(file, scene, quality)] = future.result()
+            except subprocess.CalledProcessError:
+                print(f"❌ Error: Render of {scene} failed. See {log_path}")
+                results[(file, scene, quality)] = None
+
+    failed = [f"{scene} ({file})" for (file, scene, _), output in results.items() if output is None]
+    print(f"🏁 Done: {len(results) - len(failed)}/{len(results)} scenes rendered.")
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Render Manim scene with audio post-processing.")
+    parser.add_argument("file", nargs="?",
+                        help="Path to the python file containing the Scene, or a package directory such as animations/")
+    parser.add_argument("scenes", nargs="*", help="Names of the Scene classes to render (default: every scene in file)")
+    parser.add_argument("--quality", "-q", default="l", choices=["l", "m", "h", "k"],
+                        help="Render quality (l=480p15, m=720p30, h=1080p60, k=2160p60)")
+    parser.add_argument("--preview", "-p", action="store_true", help="Preview (open) file after render")
+    parser.add_argument("--audio", "-a", help="Path to audio file", default="assets/ambient.mp3")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Number of scenes to render in parallel (default: number of cores)")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-render, ignoring the render cache")
+    parser.add_argument("--cache-max-size", type=float, default=5,
+                        help="Maximum size of the render cache in GB (default: 5)")
+    parser.add_argument("--cache-max-age", type=float, default=30,
+                        help="Evict cached renders unused for this many days (default: 30)")
+    parser.add_argument("--single-pass", action="store_true",
+                        help="Mux the audio while the video is written instead of in a second ffmpeg pass")
+    parser.add_argument("--segments", "-s", type=int, default=1,
+                        help="Split each scene into this many animation ranges rendered in parallel")
+    parser.add_argument("--sections", action="store_true",
+                        help="Re-render only the scene sections (self.next_section) whose animations changed")
+    parser.add_argument("--renderer", default="cairo", choices=RENDERERS,
+                        help="Manim renderer (opengl works headless with a software GL stack)")
+    parser.add_argument("--frame-workers", type=int, nargs="?", const=0, metavar="N",
+                        help="Rasterize the frames of long plays on N processes (default: one per core)")
+    parser.add_argument("--memory-audit", action="store_true",
+                        help="Spill removed images to disk and report live mobject memory per section to media/memory")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Log the timing and mobject counts of every play to media/instrumentation")
+    parser.add_argument("--stream", action="store_true",
+                        help="Also write a progressive HLS playlist to media/streams/<Scene> during the render")
+    parser.add_argument("--daemon", "-d", action="store_true",
+                        help="Render on the warm render daemon (start it with `uv run python -m rendering.daemon`)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record wall time, CPU time and peak RSS per render phase to media/profiles")
+    parser.add_argument("--profile-python", action="store_true",
+                        help="With --profile, also write a cProfile dump of the Python side of the render")
+    parser.add_argument("--precompile-tex", action="store_true",
+                        help="Compile the scenes' MathTex/Tex in a few batched LaTeX runs before rendering")
+    parser.add_argument("--keyframes", action="store_true",
+                        help="Only save the end state of every play and a contact sheet to media/keyframes")
+    parser.add_argument("--deliver", nargs="+", choices=list(PROFILES), metavar="PROFILE",
+                        help=f"Also encode these formats from one decode of the result ({', '.join(PROFILES)})")
+    parser.add_argument("--queue", action="store_true",
+                        help="Add the scenes to the persistent render queue instead of rendering them now")
+    parser.add_argument("--priority", type=int, default=0, help="Priority of queued jobs (higher runs first)")
+    parser.add_argument("--queue-status", action="store_true", help="List the jobs in the render queue and exit")
+    parser.add_argument("--list", action="store_true",
+                        help="List the scenes in file (default: main.py and animations/) and exit")
+
+    args = parser.parse_args()
+    if args.queue_status:
+        print_status()
+        return
+    if args.list:
+        print_scenes(SceneIndex().scenes(args.file or SCENE_ROOTS))
+        return
+    if not args.file:
+        parser.error("the following arguments are required: file")
+
+    cache = None
+    if not args.no_cache:
+        cache = RenderCache(
+            max_size=int(args.cache_max_size * 1024 ** 3),
+            max_age=args.cache_max_age * 24 * 3600
+        )
+
+    available = find_scenes(args.file)
+    if args.scenes:
+        known = {scene: file for file, scene in available}
+        missing = [scene for scene in args.scenes if scene not in known]
+        if missing:
+            print(f"❌ Error: {', '.join(missing)} not found in {args.file}")
+            sys.exit(1)
+        jobs = [(known[scene], scene) for scene in args.scenes]
+    else:
+        jobs = available
+
+    if not jobs:
+        print(f"❌ Error: No scenes found in {args.file}")
+        sys.exit(1)
+
+    if args.precompile_tex:
+        files = sorted({file for file, _ in jobs})
+        print(f"✒️ Precompiling TeX for {len(files)} files...")
+        try:
+            run_logged(["uv", "run", "python", "-m", "rendering.latex"] + files)
+        except subprocess.CalledProcessError:
+            print("⚠️ Warning: TeX precompile failed. Manim will compile the expressions as it renders.")
+
+    if args.keyframes:
+        failed = []
+        for file, scene in jobs:
+            print(f"🖼️ Keyframes of {scene}...")
+            try:
+                run_logged(keyframes_command(file, scene, args.quality))
+            except subprocess.CalledProcessError:
+                failed.append(scene)
+        if failed:
+            print(f"❌ Failed: {', '.join(failed)}")
+            sys.exit(1)
+        return
+
+    if args.queue:
+        # Workers run render.py again for each job, so pass the flags along
+        flags = []
+        if args.no_cache:
+            flags.append("--no-cache")
+        if args.single_pass:
+            flags.append("--single-pass")
+        if args.segments > 1:
+            flags += ["--segments", str(args.segments)]
+        if args.sections:
+            flags.append("--sections")
+        if args.stream:
+            flags.append("--stream")
+        if args.renderer != "cairo":
+            flags += ["--renderer", args.renderer]
+        if args.frame_workers is not None:
+            flags += ["--frame-workers", str(args.frame_workers)]
+        if args.memory_audit:
+            flags.append("--memory-audit")
+        if args.instrument:
+            flags.append("--instrument")
+        if args.profile or args.profile_python:
+            flags.append("--profile-python" if args.profile_python else "--profile")
+        if args.deliver:
+            flags += ["--deliver"] + args.deliver
+        queue = JobQueue()
+        for file, scene in jobs:
+            job_id = queue.submit(file, scene, args.quality, args.audio, flags, args.priority)
+            print(f"📥 Queued {scene} as job {job_id}")
+        print("Run `uv run python -m rendering.jobs work` to render them.")
+        return
+
+    options = {
+        "quality": args.quality,
+        "audio": args.audio,
+        "preview": args.preview,
+        "cache": cache,
+        "single_pass": args.single_pass,
+        "segments": args.segments,
+        "profile": args.profile or args.profile_python,
+        "profile_python": args.profile_python,
+        "daemon": args.daemon,
+        "deliver": args.deliver,
+        "sections": args.sections,
+        "stream": args.stream,
+        "renderer": args.renderer,
+        "frame_workers": args.frame_workers,
+        "memory_audit": args.memory_audit,
+        "instrument": args.instrument,
+    }
+
+    if len(jobs) == 1:
+        file, scene = jobs[0]
+        output = render_scene(file, scene, **options)
+        if output is None:
+            sys.exit(1)
+        return
+
+    results = render_batch(jobs, args.jobs, **options)
+    if any(output is None for output in results.values()):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
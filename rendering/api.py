@@ -0,0 +1,106 @@
+"""Render scenes from Python instead of through render.py.
+
+    from rendering.api import render_scene
+
+    result = render_scene("animations.lhc_collision", "LHCCollision", "h", audio="assets/ambient.mp3")
+    print(result.path, result.duration, result.frame_count)
+
+Renders run in this interpreter inside Manim's tempconfig, so any number of
+scenes can be rendered one after another without their config leaking into
+each other, and scene modules (and whatever they parse at import time) are
+imported only once.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from rendering.manifest import Manifest
+from rendering.metadata import read_sidecar
+from rendering.quality import module_name
+
+
+@dataclass
+class RenderResult:
+    """What a finished render produced, as indexed in the manifest."""
+
+    file: str
+    scene: str
+    quality: str
+    path: str
+    duration: float
+    frame_count: int
+    fps: float
+    width: int
+    height: int
+    render_time: float
+    audio_path: Optional[str] = None
+    animations: list = field(default_factory=list)
+
+
+def scene_file(module):
+    """Path of a scene module given as a file path or a dotted name."""
+    if module.endswith(".py") or os.sep in module:
+        return module
+    return module.replace(".", os.sep) + ".py"
+
+
+def render_scene(module, scene, quality="l", audio=None, manifest=None):
+    """Render one scene in-process and return a RenderResult.
+
+    module is a file (animations/lhc_collision.py) or a dotted module name
+    (animations.lhc_collision). With audio, the music bed is muxed while the
+    video is written and path is the <Scene>_Audio.mp4. The result is also
+    recorded in the manifest.
+    """
+    from rendering.runner import render
+
+    file = scene_file(module)
+    if audio and not os.path.exists(audio):
+        raise FileNotFoundError(f"Audio file not found at {audio}")
+
+    start = time.perf_counter()
+    output = render(file, scene, quality, audio)
+    render_time = time.perf_counter() - start
+
+    metadata = read_sidecar(output)
+    result = RenderResult(
+        file=file,
+        scene=scene,
+        quality=quality,
+        path=output,
+        duration=metadata["duration"],
+        frame_count=metadata["frame_count"],
+        fps=metadata["fps"],
+        width=metadata["width"],
+        height=metadata["height"],
+        render_time=render_time,
+        audio_path=output if audio else None,
+        animations=metadata["animations"],
+    )
+
+    fields = {"audio_path": result.audio_path} if audio else {}
+    (manifest or Manifest()).update(
+        module_name(file), scene, quality,
+        fps=result.fps,
+        path=result.path,
+        duration=result.duration,
+        frame_count=result.frame_count,
+        width=result.width,
+        height=result.height,
+        **fields
+    )
+    return result
+
+
+def render_scenes(jobs, quality="l", audio=None, manifest=None):
+    """Render (module, scene) pairs one after another in this interpreter.
+
+    Returns {scene: RenderResult}; a scene that raises stops the batch.
+    """
+    manifest = manifest or Manifest()
+    return {
+        scene: render_scene(module, scene, quality, audio, manifest)
+        for module, scene in jobs
+    }
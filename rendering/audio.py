@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import subprocess
+import time
+
+from rendering.cache import CACHE_DIR, DEFAULT_MAX_AGE
+
+# Seconds of fade-out at the end of every scene
+FADE_DURATION = 2
+
+# Ready-to-mux music beds, shared by every scene of the same length
+AUDIO_CACHE_DIR = os.path.join(CACHE_DIR, "audio")
+
+BED_EXTENSIONS = {"aac": ".m4a", "libopus": ".opus", "libmp3lame": ".mp3"}
+
+# EBU R128 loudness the music bed is normalized to: integrated LUFS, true
+# peak (dBTP) and loudness range (LU). None leaves the bed at its own level.
+LOUDNESS_TARGET = {"I": -16.0, "TP": -1.5, "LRA": 11.0}
+
+# loudnorm resamples to 192 kHz internally, so always set the output rate
+SAMPLE_RATE = 48000
+
+
+def fade_filter(duration, fade_duration=FADE_DURATION):
+    """ffmpeg afade filter that fades out over the last fade_duration seconds."""
+    fade_start = max(0, duration - fade_duration)
+    return f"afade=t=out:st={fade_start}:d={fade_duration}"
+
+
+def loudnorm_filter(measurements, target=LOUDNESS_TARGET):
+    """Second-pass loudnorm filter using the first pass's measurements.
+
+    linear=true applies one gain over the whole bed, so a bed cut to any
+    length gets the same level the full-file analysis called for.
+    """
+    return (
+        f"loudnorm=I={target['I']}:TP={target['TP']}:LRA={target['LRA']}"
+        f":measured_I={measurements['input_i']}:measured_TP={measurements['input_tp']}"
+        f":measured_LRA={measurements['input_lra']}:measured_thresh={measurements['input_thresh']}"
+        f":offset={measurements['target_offset']}:linear=true"
+    )
+
+
+def measure_loudness(audio, target=LOUDNESS_TARGET):
+    """First loudnorm pass: decode the whole file and return its measurements."""
+    ffmpeg_cmd = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-i", audio,
+        "-vn",
+        "-af", f"loudnorm=I={target['I']}:TP={target['TP']}:LRA={target['LRA']}:print_format=json",
+        "-f", "null", "-"
+    ]
+    result = subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
+    # The measurements are the last JSON object loudnorm prints to stderr
+    report = result.stderr[result.stderr.rindex("{"):result.stderr.rindex("}") + 1]
+    return json.loads(report)
+
+
+def cached_loudness(audio, target=LOUDNESS_TARGET, source_hash=None, cache_dir=AUDIO_CACHE_DIR):
+    """measure_loudness, run once per source file contents and target."""
+    source_hash = source_hash or _hash_source(audio)
+    target_key = ":".join(f"{target[name]}" for name in ("I", "TP", "LRA"))
+    path = os.path.join(cache_dir, f"{source_hash}.{target_key}.loudnorm.json")
+    if os.path.exists(path):
+        os.utime(path)
+        with open(path, "r") as f:
+            return json.load(f)
+
+    measurements = measure_loudness(audio, target)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(measurements, f, indent=2)
+    os.replace(tmp, path)
+    return measurements
+
+
+def bed_filter(audio, duration, fade_duration=FADE_DURATION, loudness=LOUDNESS_TARGET, source_hash=None):
+    """Audio filters that turn the source into the bed: loudness, then fade.
+
+    With duration None (not known yet), the bed is left without the fade.
+    """
+    filters = []
+    if loudness:
+        filters.append(loudnorm_filter(cached_loudness(audio, loudness, source_hash), loudness))
+    if duration is not None:
+        filters.append(fade_filter(duration, fade_duration))
+    return ",".join(filters) or "anull"
+
+
+def add_audio(video, audio, output, duration, fade_duration=FADE_DURATION, fps=None):
+    """Mux a music bed under a silent video, fading it out at the end.
+
+    The faded bed comes from the audio cache, so both tracks are stream-copied.
+    """
+    bed = cached_audio_bed(audio, duration, fade_duration, fps=fps)
+    ffmpeg_cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-i", video,
+        "-i", bed,
+        "-map", "0:v",
+        "-map", "1:a",
+        "-c", "copy",
+        "-shortest",
+        output
+    ]
+    subprocess.run(ffmpeg_cmd, check=True)
+    return output
+
+
+def build_audio_bed(audio, duration, output, fade_duration=FADE_DURATION, codec="aac",
+                    loudness=LOUDNESS_TARGET, source_hash=None):
+    """Encode the music bed cut to duration, normalized and with the fade
+    applied, ready to be stream-copied next to a video."""
+    ffmpeg_cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-i", audio,
+        "-vn",
+        "-t", f"{duration:.6f}",
+        "-af", bed_filter(audio, duration, fade_duration, loudness, source_hash),
+        "-ar", str(SAMPLE_RATE),
+        "-c:a", codec,
+        output
+    ]
+    subprocess.run(ffmpeg_cmd, check=True)
+    return output
+
+
+def _hash_source(audio):
+    digest = hashlib.sha256()
+    with open(audio, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bed_key(source_hash, duration, fade_duration=FADE_DURATION, codec="aac", loudness=LOUDNESS_TARGET):
+    """Cache key of a music bed: source contents, length, fade, codec and loudness."""
+    loudness_key = json.dumps(loudness, sort_keys=True)
+    return hashlib.sha256(
+        f"{source_hash}:{duration:.6f}:{fade_duration}:{codec}:{loudness_key}".encode()
+    ).hexdigest()
+
+
+def cached_audio_bed(audio, duration, fade_duration=FADE_DURATION, codec="aac",
+                     fps=None, loudness=LOUDNESS_TARGET, cache_dir=AUDIO_CACHE_DIR):
+    """Path of a faded music bed of the given length, encoding it only once.
+
+    With fps, the duration is rounded to a whole frame first so that renders
+    of the same length share a bed despite float noise in their durations.
+    """
+    if fps:
+        duration = round(duration * fps) / fps
+
+    os.makedirs(cache_dir, exist_ok=True)
+    source_hash = _hash_source(audio)
+    key = bed_key(source_hash, duration, fade_duration, codec, loudness)
+    path = os.path.join(cache_dir, key + BED_EXTENSIONS.get(codec, ".mka"))
+    if os.path.exists(path):
+        os.utime(path)
+        return path
+
+    # Encode next to the final name, so parallel renders never see half a bed
+    root, extension = os.path.splitext(path)
+    tmp = f"{root}.{os.getpid()}.tmp{extension}"
+    build_audio_bed(audio, duration, tmp, fade_duration, codec, loudness, source_hash)
+    os.replace(tmp, path)
+    evict_audio_beds(cache_dir)
+    return path
+
+
+def evict_audio_beds(cache_dir=AUDIO_CACHE_DIR, max_age=DEFAULT_MAX_AGE):
+    """Drop beds that no render has used for longer than max_age."""
+    now = time.time()
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,244 @@
+"""Render-performance benchmarks of every scene, with a regression check.
+
+    uv run python -m rendering.benchmark run                      # every scene, -q l, 300 frames each
+    uv run python -m rendering.benchmark run LHCCollision --save-baseline
+    uv run python -m rendering.benchmark compare                  # latest results against the baseline
+
+Every scene gets the same frame budget: a timing pass measures construct on
+its own (nothing drawn or encoded) and finds the first animations that add
+up to the budget, and only those are rendered, from scratch, in a runner of
+their own. A result records construct time, rendered frames per second,
+rasterize and encode time, the runner's peak RSS and the most mobjects and
+points on screen. Results go to media/benchmarks/bench_<q>_<stamp>.json.
+
+compare exits with status 1 when a scene's construct or render time grew by
+more than the threshold over the baseline (media/benchmarks/baseline_<q>.json),
+so it can gate a change in CI or before a merge.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from rendering.compare import REPORT_DIR
+from rendering.discovery import SceneIndex
+from rendering.metadata import read_sidecar
+from rendering.quality import QUALITIES, video_path
+
+# Frames rendered per scene; shorter scenes are rendered whole
+FRAME_BUDGET = 300
+
+# Allowed slowdown over the baseline before compare fails
+THRESHOLD = 0.15
+
+# Slowdowns smaller than this many seconds are noise, whatever the ratio
+MIN_REGRESSION = 0.25
+
+# Metrics compare checks; all are seconds, so larger is slower
+CHECKED = ("construct", "render")
+
+
+def baseline_path(quality, directory=REPORT_DIR):
+    return os.path.join(directory, f"baseline_{quality}.json")
+
+
+def latest_results(quality, directory=REPORT_DIR):
+    paths = sorted(glob.glob(os.path.join(directory, f"bench_{quality}_*.json")))
+    return paths[-1] if paths else None
+
+
+def budget_range(timeline, fps, frames):
+    """Index of the last animation needed to reach a frame budget."""
+    total = 0
+    for entry in timeline:
+        total += round(entry["duration"] * fps)
+        if total >= frames:
+            return entry["index"]
+    return timeline[-1]["index"]
+
+
+def _runner(file, scene, quality, args, profile_path, log):
+    cmd = ["uv", "run", "python", "-m", "rendering.runner", file, scene, "--quality", quality,
+           "--profile", profile_path] + args
+    subprocess.run(cmd, check=True, stdout=log, stderr=subprocess.STDOUT)
+    with open(profile_path, "r") as f:
+        return json.load(f)
+
+
+def _wall(phases, name):
+    return phases.get(name, {}).get("wall", 0.0)
+
+
+def benchmark_scene(file, scene, quality="l", frames=FRAME_BUDGET, log_path=None):
+    """Benchmark one scene and return its result."""
+    fps = QUALITIES[quality]["fps"]
+    name = f"{scene}_bench"
+    fd, profile_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    fd, timeline_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        with open(log_path or os.devnull, "w") as log:
+            phases = _runner(file, scene, quality, ["--timeline", timeline_path], profile_path, log)
+            with open(timeline_path, "r") as f:
+                timeline = json.load(f)
+            if not timeline:
+                raise ValueError(f"{scene} plays no animations")
+            construct = _wall(phases, "construct")
+
+            last = budget_range(timeline, fps, frames)
+            phases = _runner(file, scene, quality, [
+                "--upto-animation", str(last), "--output-name", name, "--disable-caching"
+            ], profile_path, log)
+    finally:
+        os.remove(profile_path)
+        os.remove(timeline_path)
+
+    path = os.path.join(os.path.dirname(video_path(file, scene, quality)), f"{name}.mp4")
+    rendered = read_sidecar(path)["frame_count"]
+    render = _wall(phases, "render") - _wall(phases, "import manim") - _wall(phases, "import scene")
+    played = timeline[:last + 1]
+    return {
+        "scene": scene,
+        "file": file,
+        "animations": len(played),
+        "frames": rendered,
+        "construct": max(0.0, construct),
+        "render": render,
+        "fps": rendered / render if render else 0.0,
+        "rasterize": _wall(phases, "rasterize"),
+        "encode": _wall(phases, "encode"),
+        "peak_rss_mb": phases.get("render", {}).get("peak_rss_mb"),
+        "mobjects": max(entry["mobjects"] for entry in played),
+        "points": max(entry["points"] for entry in played),
+    }
+
+
+def run(scenes=None, quality="l", frames=FRAME_BUDGET, directory=REPORT_DIR):
+    """Benchmark scenes (default: all of them) and write the results file."""
+    available = SceneIndex().scenes()
+    if scenes:
+        known = {scene["name"]: scene for scene in available}
+        missing = [name for name in scenes if name not in known]
+        if missing:
+            raise ValueError(f"Unknown scenes: {', '.join(missing)}")
+        available = [known[name] for name in scenes]
+
+    log_dir = os.path.join("media", "logs", "benchmark")
+    os.makedirs(log_dir, exist_ok=True)
+    results = {}
+    for scene in available:
+        name = scene["name"]
+        log_path = os.path.join(log_dir, f"{name}.log")
+        print(f"⏱️ {name}...", flush=True)
+        try:
+            results[name] = benchmark_scene(scene["file"], name, quality, frames, log_path)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            print(f"❌ {name} failed ({e}), see {log_path}")
+            results[name] = {"scene": name, "file": scene["file"], "error": str(e)}
+
+    report = {
+        "quality": quality,
+        "frame_budget": frames,
+        "time": time.time(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"bench_{quality}_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path, report
+
+
+def print_results(report):
+    print(f"\n  {'SCENE':<24} {'FRAMES':>6} {'CONSTR':>7} {'RENDER':>7} {'FPS':>6} {'RASTER':>7} "
+          f"{'ENCODE':>7} {'RSS MB':>7} {'MOBJ':>6} {'POINTS':>9}")
+    for name, result in report["results"].items():
+        if "error" in result:
+            print(f"  {name:<24} failed: {result['error']}")
+            continue
+        print(f"  {name:<24} {result['frames']:>6} {result['construct']:>6.2f}s {result['render']:>6.2f}s "
+              f"{result['fps']:>6.1f} {result['rasterize']:>6.2f}s {result['encode']:>6.2f}s "
+              f"{result['peak_rss_mb'] or 0:>7.0f} {result['mobjects']:>6} {result['points']:>9}")
+
+
+def compare(report, baseline, threshold=THRESHOLD):
+    """Scenes that got slower than the baseline, as (scene, metric, old, new)."""
+    regressions = []
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name)
+        if old is None or "error" in old:
+            continue
+        if "error" in result:
+            regressions.append((name, "error", None, None))
+            continue
+        for metric in CHECKED:
+            if result[metric] > old[metric] * (1 + threshold) and result[metric] - old[metric] > MIN_REGRESSION:
+                regressions.append((name, metric, old[metric], result[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scene render performance.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Benchmark scenes and write a results file")
+    run_parser.add_argument("scenes", nargs="*", help="Scenes to benchmark (default: all)")
+    run_parser.add_argument("--quality", "-q", default="l", choices=list(QUALITIES))
+    run_parser.add_argument("--frames", type=int, default=FRAME_BUDGET, help="Frames to render per scene")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Also store the results as the baseline")
+
+    compare_parser = commands.add_parser("compare", help="Fail if results are slower than the baseline")
+    compare_parser.add_argument("results", nargs="?", help="Results file (default: the latest)")
+    compare_parser.add_argument("--quality", "-q", default="l", choices=list(QUALITIES))
+    compare_parser.add_argument("--baseline", help="Baseline file (default: media/benchmarks/baseline_<q>.json)")
+    compare_parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                                help="Allowed slowdown as a fraction (default: 0.15)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        path, report = run(args.scenes, args.quality, args.frames)
+        print_results(report)
+        print(f"\n📊 Results saved to {path}")
+        if args.save_baseline:
+            with open(baseline_path(args.quality), "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"📌 Baseline saved to {baseline_path(args.quality)}")
+        return
+
+    results = args.results or latest_results(args.quality)
+    baseline = args.baseline or baseline_path(args.quality)
+    if results is None or not os.path.exists(baseline):
+        print("❌ Error: Need a results file and a baseline; run `benchmark run --save-baseline` first.")
+        sys.exit(2)
+    with open(results, "r") as f:
+        report = json.load(f)
+    with open(baseline, "r") as f:
+        reference = json.load(f)
+    if (report["quality"], report["frame_budget"]) != (reference["quality"], reference["frame_budget"]):
+        print("⚠️ Warning: Results and baseline use different qualities or frame budgets.")
+
+    print_results(report)
+    regressions = compare(report, reference, args.threshold)
+    if not regressions:
+        print(f"\n✅ No scene is more than {args.threshold:.0%} slower than {baseline}")
+        return
+    print(f"\n❌ Regressions against {baseline}:")
+    for name, metric, old, new in regressions:
+        if metric == "error":
+            print(f"   {name}: failed to render")
+        else:
+            change = f" (+{(new - old) / old:.0%})" if old else ""
+            print(f"   {name}: {metric} {old:.2f}s -> {new:.2f}s{change}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import ast
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+CACHE_DIR = ".render_cache"
+
+# Eviction defaults: keep at most 5 GB of finished videos, none older than 30 days
+DEFAULT_MAX_SIZE = 5 * 1024 ** 3
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+# Bump when the render pipeline changes in a way that alters the output
+CACHE_VERSION = "2"
+
+# Files outside the scene sources that still change the finished video:
+# the locked dependencies and every module that draws, encodes, cuts, joins
+# or muxes it. Tooling (help text, benchmarks, the job queue) is left out,
+# so editing it keeps cached renders valid.
+OUTPUT_MODULES = (
+    "writers", "runner", "seeding", "audio", "renderers", "quality",
+    "parallel", "metadata", "segments", "sections",
+)
+ENVIRONMENT_FILES = ["uv.lock"] + [os.path.join("rendering", f"{module}.py") for module in OUTPUT_MODULES]
+
+
+def _module_to_path(module):
+    """Map a dotted module name to a project file, or None if it is not ours."""
+    base = module.replace(".", os.sep)
+    for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def collect_inputs(file):
+    """Every project file a scene file depends on: itself, local imports and assets.
+
+    Imports are followed transitively (e.g. warehouse_v3 -> map_builder), and
+    any string literal naming an existing file (e.g. "assets/ontario.geojson")
+    is treated as an asset.
+    """
+    seen = set()
+    pending = [os.path.normpath(file)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(path, "r") as f:
+            tree = ast.parse(f.read(), filename=path)
+
+        helpers, assets = file_references(tree)
+        seen.update(assets)
+        pending += helpers
+    return sorted(seen)
+
+
+def file_references(tree):
+    """Project modules imported by a parsed file, and existing files named by
+    its string literals, as (helper paths, asset paths)."""
+    helpers = []
+    assets = []
+    for node in ast.walk(tree):
+        modules = []
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules = [node.module]
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if len(node.value) < 256 and os.path.isfile(node.value):
+                assets.append(os.path.normpath(node.value))
+
+        for module in modules:
+            module_path = _module_to_path(module)
+            if module_path:
+                helpers.append(os.path.normpath(module_path))
+    return helpers, assets
+
+
+def _hash_file(digest, path):
+    digest.update(path.encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def environment_hash():
+    """Hash of the cache version and the ENVIRONMENT_FILES, shared by every
+    cache of rendered video."""
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}".encode())
+    for path in sorted({path for pattern in ENVIRONMENT_FILES for path in glob.glob(pattern)}):
+        _hash_file(digest, path)
+    return digest.hexdigest()
+
+
+def input_hash(file, scene, quality, audio=None, renderer="cairo"):
+    """Hash of everything that determines the finished <Scene>_Audio.mp4."""
+    digest = hashlib.sha256()
+    digest.update(f"{environment_hash()}:{scene}:{quality}".encode())
+    # Keeps the keys of existing Cairo renders valid
+    if renderer != "cairo":
+        digest.update(f":{renderer}".encode())
+
+    inputs = collect_inputs(file)
+    if audio and os.path.isfile(audio):
+        inputs.append(os.path.normpath(audio))
+
+    for path in sorted(set(inputs)):
+        _hash_file(digest, path)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Content-addressed store of finished scene videos.
+
+    Objects live in <root>/objects/<key>.mp4 next to a <key>.json record of
+    where the output belongs. A record's mtime is its object's last use, so eviction
+    needs no shared index and parallel workers can use the cache safely.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_size=DEFAULT_MAX_SIZE, max_age=DEFAULT_MAX_AGE):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def _object_path(self, key):
+        return os.path.join(self.objects_dir, f"{key}.mp4")
+
+    def get(self, key):
+        """Return the output path for a cached render, restoring it if needed."""
+        obj = self._object_path(key)
+        record_path = os.path.join(self.objects_dir, f"{key}.json")
+        if not (os.path.exists(obj) and os.path.exists(record_path)):
+            return None
+
+        with open(record_path, "r") as f:
+            output = json.load(f)["output"]
+
+        # Copies keep the object's mtime, so a matching size and mtime means
+        # the output on disk is still the cached one.
+        obj_stat = os.stat(obj)
+        if os.path.exists(output):
+            out_stat = os.stat(output)
+            up_to_date = (out_stat.st_size, int(out_stat.st_mtime)) == (obj_stat.st_size, int(obj_stat.st_mtime))
+        else:
+            up_to_date = False
+        if not up_to_date:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            shutil.copy2(obj, output)
+
+        # Touch the record rather than the object, so the copy check above still works
+        os.utime(record_path)
+        return output
+
+    def put(self, key, output, scene=None):
+        """Store a finished output under its input hash and evict old entries."""
+        os.makedirs(self.objects_dir, exist_ok=True)
+        obj = self._object_path(key)
+        tmp = f"{obj}.{os.getpid()}.tmp"
+        shutil.copy2(output, tmp)
+        os.replace(tmp, obj)
+
+        record = {"scene": scene, "output": output, "created": time.time()}
+        record_path = os.path.join(self.objects_dir, f"{key}.json")
+        with open(f"{record_path}.{os.getpid()}.tmp", "w") as f:
+            json.dump(record, f, indent=2)
+        os.replace(f"{record_path}.{os.getpid()}.tmp", record_path)
+
+        self.evict()
+
+    def entries(self):
+        """List (key, size, last_used) for every cached object."""
+        if not os.path.isdir(self.objects_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.objects_dir):
+            if not name.endswith(".mp4"):
+                continue
+            key = name[:-len(".mp4")]
+            try:
+                size = os.path.getsize(self._object_path(key))
+                last_used = os.path.getmtime(os.path.join(self.objects_dir, f"{key}.json"))
+            except FileNotFoundError:
+                continue
+            entries.append((key, size, last_used))
+        return entries
+
+    def remove(self, key):
+        for path in (self._object_path(key), os.path.join(self.objects_dir, f"{key}.json")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        """Drop entries unused for longer than max_age, then the least recently
+        used ones until the cache fits in max_size. Returns the evicted keys."""
+        now = time.time()
+        evicted = []
+        entries = []
+        for key, size, last_used in self.entries():
+            if self.max_age is not None and now - last_used > self.max_age:
+                evicted.append(key)
+            else:
+                entries.append((key, size, last_used))
+
+        if self.max_size is not None:
+            entries.sort(key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            while entries and total > self.max_size:
+                key, size, _ = entries.pop(0)
+                evicted.append(key)
+                total -= size
+
+        for key in evicted:
+            self.remove(key)
+        return evicted
@@ -0,0 +1,156 @@
+"""Render scenes with each renderer and compare their speed and pixels.
+
+    uv run python -m rendering.compare animations/lhc_collision.py LHCCollision -q l
+
+Each renderer renders the scene from scratch (Manim's partial movie cache
+off) in its own runner process. The report gives wall time, rendered frames
+per second and time spent rasterizing for each renderer, plus how far each
+renderer's frames are from the first one's: mean absolute difference (0-255)
+and PSNR. Results are printed and saved to media/benchmarks.
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import tempfile
+import time
+
+from rendering.metadata import decoded_frames, read_sidecar
+from rendering.quality import QUALITIES, video_path
+from rendering.renderers import RENDERERS
+
+REPORT_DIR = os.path.join("media", "benchmarks")
+
+# PSNR reported for identical frames
+MAX_PSNR = 100.0
+
+
+def render_with(file, scene, quality, renderer, log_path=None):
+    """Render a scene with one renderer and return its timings."""
+    name = f"{scene}_{renderer}"
+    fd, profile_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    cmd = [
+        "uv", "run", "python", "-m", "rendering.runner", file, scene,
+        "--quality", quality, "--renderer", renderer, "--output-name", name,
+        "--disable-caching", "--profile", profile_path
+    ]
+    try:
+        start = time.perf_counter()
+        with open(log_path or os.devnull, "w") as log:
+            subprocess.run(cmd, check=True, stdout=log, stderr=subprocess.STDOUT)
+        wall = time.perf_counter() - start
+        with open(profile_path, "r") as f:
+            phases = json.load(f)
+    finally:
+        os.remove(profile_path)
+
+    path = os.path.join(os.path.dirname(video_path(file, scene, quality)), f"{name}.mp4")
+    frames = read_sidecar(path)["frame_count"]
+    return {
+        "renderer": renderer,
+        "path": path,
+        "wall": wall,
+        "frames": frames,
+        "fps": frames / wall if wall else 0.0,
+        "rasterize": phases.get("rasterize", {}).get("wall"),
+    }
+
+
+def pixel_difference(reference, other, fps):
+    """Per-frame mean absolute difference and PSNR between two videos.
+
+    Frames are lined up by timestamp at fps, not by decode order, so a video
+    that stores a hold as one long frame still compares frame by frame.
+    """
+    import numpy as np
+
+    diffs = []
+    psnrs = []
+    frames_a = decoded_frames(reference, fps, "rgb24")
+    frames_b = decoded_frames(other, fps, "rgb24")
+    for pixels_a, pixels_b in zip(frames_a, frames_b):
+        pixels_a = pixels_a.astype(np.int16)
+        pixels_b = pixels_b.astype(np.int16)
+        if pixels_a.shape != pixels_b.shape:
+            raise ValueError(f"{reference} and {other} have different frame sizes")
+        delta = pixels_a - pixels_b
+        diffs.append(float(np.abs(delta).mean()))
+        mse = float((delta.astype(np.float64) ** 2).mean())
+        psnrs.append(MAX_PSNR if mse == 0 else min(MAX_PSNR, 10 * math.log10(255 ** 2 / mse)))
+
+    if not diffs:
+        return {"frames_compared": 0}
+    return {
+        "frames_compared": len(diffs),
+        "mean_abs_diff": sum(diffs) / len(diffs),
+        "max_abs_diff": max(diffs),
+        "mean_psnr": sum(psnrs) / len(psnrs),
+        "min_psnr": min(psnrs),
+    }
+
+
+def compare_scene(file, scene, quality, renderers=RENDERERS, log_dir=None):
+    """Render a scene with every renderer and diff each against the first."""
+    results = []
+    for renderer in renderers:
+        log_path = os.path.join(log_dir, f"{scene}_{renderer}.log") if log_dir else None
+        print(f"🎥 {scene} with {renderer}...", flush=True)
+        try:
+            results.append(render_with(file, scene, quality, renderer, log_path))
+        except subprocess.CalledProcessError as e:
+            results.append({"renderer": renderer, "error": f"runner exited with {e.returncode}", "log": log_path})
+
+    reference = results[0]
+    for result in results[1:]:
+        if "error" not in result and "error" not in reference:
+            result["difference"] = pixel_difference(reference["path"], result["path"], QUALITIES[quality]["fps"])
+    return {"scene": scene, "file": file, "quality": quality, "results": results}
+
+
+def print_comparison(comparison):
+    print(f"\n{comparison['scene']} ({QUALITIES[comparison['quality']]['name']})")
+    print(f"  {'RENDERER':<8} {'WALL':>8} {'FRAMES':>7} {'FPS':>7} {'RASTER':>8}  DIFF vs {comparison['results'][0]['renderer']}")
+    for result in comparison["results"]:
+        if "error" in result:
+            print(f"  {result['renderer']:<8} failed: {result['error']}" + (f", see {result['log']}" if result["log"] else ""))
+            continue
+        raster = f"{result['rasterize']:.1f}s" if result["rasterize"] is not None else "-"
+        line = f"  {result['renderer']:<8} {result['wall']:>7.1f}s {result['frames']:>7} {result['fps']:>7.1f} {raster:>8}"
+        difference = result.get("difference")
+        if difference and difference["frames_compared"]:
+            line += (f"  mean |Δ| {difference['mean_abs_diff']:.2f}, max {difference['max_abs_diff']:.2f},"
+                     f" PSNR {difference['mean_psnr']:.1f} dB (min {difference['min_psnr']:.1f})")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Manim renderers on the same scenes.")
+    parser.add_argument("file", help="Path to the python file containing the scenes")
+    parser.add_argument("scenes", nargs="+", help="Names of the Scene classes to compare")
+    parser.add_argument("--quality", "-q", default="l", choices=list(QUALITIES))
+    parser.add_argument("--renderers", nargs="+", default=list(RENDERERS), choices=RENDERERS,
+                        help="Renderers to compare; differences are against the first")
+    args = parser.parse_args()
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    log_dir = os.path.join("media", "logs", "compare")
+    os.makedirs(log_dir, exist_ok=True)
+
+    comparisons = []
+    for scene in args.scenes:
+        comparison = compare_scene(args.file, scene, args.quality, args.renderers, log_dir)
+        print_comparison(comparison)
+        comparisons.append(comparison)
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    report_path = os.path.join(REPORT_DIR, f"renderers_{args.quality}_{stamp}.json")
+    with open(report_path, "w") as f:
+        json.dump(comparisons, f, indent=2)
+    print(f"\n📊 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
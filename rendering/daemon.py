@@ -0,0 +1,223 @@
+"""Long-lived render server that keeps Manim imported between renders.
+
+Start it once, then point render.py at it:
+
+    uv run python -m rendering.daemon
+    python render.py animations/lhc_collision.py LHCCollision --daemon
+
+Jobs arrive as JSON lines on a Unix socket and are rendered one at a time in
+this interpreter, so only the first one pays for `uv run` and
+`from manim import *`. Every submitted scene is also watched: when one of
+its sources under animations/ or assets/ changes, it is re-rendered.
+"""
+
+import argparse
+import glob
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+
+from rendering.api import render_scene
+from rendering.cache import collect_inputs
+from rendering.manifest import Manifest
+from rendering.runner import forget_modules
+
+SOCKET_PATH = os.path.join("media", "render_daemon.sock")
+
+# Changes to these re-render the watched scenes that depend on them
+WATCH_PATTERNS = [os.path.join("animations", "*.py"), os.path.join("assets", "*")]
+
+# Seconds between two scans of the watched files
+POLL_INTERVAL = 0.5
+
+
+class DaemonError(RuntimeError):
+    """The daemon is not running or could not render a job."""
+
+
+def submit(file, scene, quality="l", audio=None, watch=True, socket_path=SOCKET_PATH):
+    """Render a scene on the running daemon and return its output path.
+
+    Blocks until the render is done. With watch, the daemon keeps
+    re-rendering the scene whenever its sources change.
+    """
+    job = {"file": file, "scene": scene, "quality": quality, "audio": audio, "watch": watch}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(json.dumps(job).encode() + b"\n")
+            reply = json.loads(client.makefile("rb").readline())
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise DaemonError(f"No render daemon at {socket_path}. Start one with `uv run python -m rendering.daemon`.") from e
+    except ValueError as e:
+        raise DaemonError(f"The render daemon closed the connection while rendering {scene}.") from e
+
+    if not reply["ok"]:
+        raise DaemonError(reply["error"])
+    return reply["output"]
+
+
+def _job_key(job):
+    return (job["file"], job["scene"], job["quality"])
+
+
+def _forget_modules(paths):
+    """Drop already imported project modules built from any of paths.
+
+    Together with runner.forget_modules this makes both scene files and
+    their local imports (e.g. map_builder) pick up edits.
+    """
+    paths = {os.path.abspath(path) for path in paths}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.abspath(path) in paths:
+            del sys.modules[name]
+
+
+class RenderDaemon:
+    """Renders queued jobs on a single thread and re-queues watched jobs
+    whose inputs change.
+
+    Manim keeps its configuration in module globals, so renders must never
+    overlap; the socket handlers only enqueue and wait. For the same reason
+    the watcher only records changed files, and the worker drops the
+    modules built from them between jobs.
+    """
+
+    def __init__(self, watch_patterns=WATCH_PATTERNS, poll_interval=POLL_INTERVAL):
+        self.watch_patterns = watch_patterns
+        self.poll_interval = poll_interval
+        self.jobs = queue.Queue()
+        self.manifest = Manifest()
+        # (file, scene, quality) -> (job, input files)
+        self.watched = {}
+        # Files changed since the worker last dropped the modules built from them
+        self.changed = set()
+        self.lock = threading.Lock()
+
+    def enqueue(self, job):
+        """Queue a job and return an event plus a result dict filled once it is done."""
+        done = threading.Event()
+        result = {}
+        self.jobs.put((job, done, result))
+        return done, result
+
+    def _reload_changed(self):
+        with self.lock:
+            changed, self.changed = self.changed, set()
+        if changed:
+            _forget_modules(changed)
+            forget_modules()
+
+    def work(self):
+        while True:
+            job, done, result = self.jobs.get()
+            self._reload_changed()
+            file, scene, quality = _job_key(job)
+            print(f"🎥 Rendering {scene} ({quality}) from {file}...", flush=True)
+            try:
+                start = time.perf_counter()
+                result["output"] = render_scene(file, scene, quality, job.get("audio"), self.manifest).path
+                result["ok"] = True
+                print(f"✅ {scene} done in {time.perf_counter() - start:.1f}s: {result['output']}", flush=True)
+            except BaseException as e:
+                # A broken scene (even one calling sys.exit) must not take the daemon down
+                traceback.print_exc()
+                result["ok"] = False
+                result["error"] = f"Render of {scene} failed: {e!r}"
+                if isinstance(e, KeyboardInterrupt):
+                    raise
+            finally:
+                if job.get("watch"):
+                    with self.lock:
+                        self.watched[_job_key(job)] = (job, collect_inputs(file))
+                done.set()
+
+    def _snapshot(self):
+        paths = set()
+        for pattern in self.watch_patterns:
+            paths.update(os.path.normpath(path) for path in glob.glob(pattern))
+        with self.lock:
+            for _, inputs in self.watched.values():
+                paths.update(inputs)
+
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def watch(self):
+        """Poll the watched files and re-queue the jobs that depend on changed ones."""
+        previous = self._snapshot()
+        while True:
+            time.sleep(self.poll_interval)
+            current = self._snapshot()
+            changed = {
+                path for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)
+            }
+            previous = current
+            if not changed:
+                continue
+
+            with self.lock:
+                self.changed.update(changed)
+                stale = [job for job, inputs in self.watched.values() if changed.intersection(inputs)]
+            for job in stale:
+                print(f"👀 {', '.join(sorted(changed))} changed, re-rendering {job['scene']}", flush=True)
+                self.enqueue(job)
+
+    def serve(self, socket_path=SOCKET_PATH):
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                job = json.loads(self.rfile.readline())
+                done, result = daemon.enqueue(job)
+                done.wait()
+                self.wfile.write(json.dumps(result).encode() + b"\n")
+
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        threading.Thread(target=self.watch, daemon=True).start()
+        server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"🟢 Render daemon listening on {socket_path}", flush=True)
+        try:
+            self.work()
+        finally:
+            server.shutdown()
+            server.server_close()
+            os.remove(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Manim renders from a warm interpreter.")
+    parser.add_argument("--socket", default=SOCKET_PATH, help=f"Unix socket to listen on (default: {SOCKET_PATH})")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL,
+                        help="Seconds between checks of the watched files")
+    args = parser.parse_args()
+
+    # Pay for the Manim import before the first job arrives
+    import manim  # noqa: F401
+
+    try:
+        RenderDaemon(poll_interval=args.poll_interval).serve(args.socket)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Encode every shipped format of a scene from one decode of its master.
+
+All profiles come out of a single ffmpeg run: the master is decoded once and
+a filter graph splits the frames (and the faded music bed) into one branch
+per profile, each with its own scaling and codecs.
+
+    python render.py animations/lhc_collision.py LHCCollision -q h --deliver 1080p 720p webm gif
+"""
+
+import os
+import subprocess
+
+from rendering.audio import FADE_DURATION, SAMPLE_RATE, bed_filter
+
+DELIVERABLES_DIR = os.path.join("media", "deliverables")
+
+# "height" is a ceiling: masters rendered at a lower quality are not upscaled.
+# "audio" is None for formats without sound.
+PROFILES = {
+    "1080p": {
+        "extension": "mp4",
+        "height": 1080,
+        "video": ["-c:v", "libx264", "-crf", "18", "-preset", "medium", "-pix_fmt", "yuv420p",
+                  "-movflags", "+faststart"],
+        "audio": ["-c:a", "aac", "-b:a", "192k"],
+    },
+    "720p": {
+        "extension": "mp4",
+        "height": 720,
+        "video": ["-c:v", "libx264", "-crf", "21", "-preset", "medium", "-pix_fmt", "yuv420p",
+                  "-movflags", "+faststart"],
+        "audio": ["-c:a", "aac", "-b:a", "128k"],
+    },
+    "webm": {
+        "extension": "webm",
+        "height": 1080,
+        "video": ["-c:v", "libvpx-vp9", "-crf", "32", "-b:v", "0", "-row-mt", "1"],
+        "audio": ["-c:a", "libopus", "-b:a", "128k"],
+    },
+    "gif": {
+        "extension": "gif",
+        "height": 360,
+        "fps": 12,
+        "video": [],
+        "audio": None,
+    },
+}
+
+
+def deliverable_path(scene, profile, output_dir=DELIVERABLES_DIR):
+    return os.path.join(output_dir, f"{scene}_{profile}.{PROFILES[profile]['extension']}")
+
+
+def build_filter_graph(profiles, audio_input=None, duration=None, fade_duration=FADE_DURATION, audio=None):
+    """Filter graph splitting input 0's video (and audio_input's audio) per profile.
+
+    audio_input is "0:a" to reuse the master's own (already faded) track, or
+    "1:a" for the music bed file audio, which is cut to duration, normalized
+    and faded here.
+    Returns the graph and {profile: (video label, audio label or None)}.
+    """
+    chains = []
+    labels = {}
+
+    split = "".join(f"[v{i}]" for i in range(len(profiles)))
+    chains.append(f"[0:v]split={len(profiles)}{split}")
+    for i, name in enumerate(profiles):
+        profile = PROFILES[name]
+        scale = f"scale=-2:'min({profile['height']},ih)':flags=lanczos"
+        if profile["extension"] == "gif":
+            # A palette per video keeps the GIF close to the master's colours
+            chains.append(
+                f"[v{i}]fps={profile['fps']},{scale},split[g{i}a][g{i}b];"
+                f"[g{i}a]palettegen=stats_mode=diff[p{i}];"
+                f"[g{i}b][p{i}]paletteuse=dither=sierra2_4a[out{i}]"
+            )
+        else:
+            chains.append(f"[v{i}]{scale}[out{i}]")
+        labels[name] = (f"[out{i}]", None)
+
+    with_audio = [name for name in profiles if PROFILES[name]["audio"] is not None]
+    if audio_input and with_audio:
+        filters = []
+        if audio_input != "0:a":
+            filters = [
+                f"atrim=end={duration:.6f}",
+                bed_filter(audio, duration, fade_duration),
+                f"aresample={SAMPLE_RATE}",
+            ]
+        split = "".join(f"[a{i}]" for i in range(len(with_audio)))
+        filters.append(f"asplit={len(with_audio)}{split}")
+        chains.append(f"[{audio_input}]" + ",".join(filters))
+        for i, name in enumerate(with_audio):
+            labels[name] = (labels[name][0], f"[a{i}]")
+
+    return ";".join(chains), labels
+
+
+def transcode(master, scene, profiles, audio=None, duration=None, fade_duration=FADE_DURATION,
+              output_dir=DELIVERABLES_DIR):
+    """Encode master into every profile in one ffmpeg run and return the paths.
+
+    With audio (and the master's duration), the music bed is normalized and
+    faded the same way as the audio stage does. Without it, the master's own
+    audio track is used if it has one.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    cmd = ["ffmpeg", "-y", "-v", "error", "-i", master]
+    if audio:
+        cmd += ["-i", audio]
+        audio_input = "1:a"
+    else:
+        audio_input = "0:a" if _has_audio(master) else None
+
+    graph, labels = build_filter_graph(profiles, audio_input, duration, fade_duration, audio)
+    cmd += ["-filter_complex", graph]
+
+    outputs = {}
+    for name in profiles:
+        profile = PROFILES[name]
+        video_label, audio_label = labels[name]
+        cmd += ["-map", video_label] + profile["video"]
+        if audio_label:
+            cmd += ["-map", audio_label] + profile["audio"] + ["-shortest"]
+        outputs[name] = deliverable_path(scene, name, output_dir)
+        cmd.append(outputs[name])
+
+    subprocess.run(cmd, check=True)
+    return outputs
+
+
+def _has_audio(video):
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "a", "-show_entries", "stream=index", "-of", "csv=p=0", video],
+        capture_output=True, text=True
+    )
+    return bool(result.stdout.strip())
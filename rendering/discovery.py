@@ -0,0 +1,166 @@
+"""Index of the project's scenes, built without importing Manim.
+
+    uv run python -m rendering.discovery            # every scene in main.py and animations/
+    uv run python -m rendering.discovery animations/warehouse_v3.py --json
+
+Scene files are parsed, not imported, so listing scenes, checking names and
+planning a batch never pay for `from manim import *`. Each file's entry
+records its Scene subclasses (with their direct base and the Manim scene
+class they come from, e.g. MovingCameraScene), the project modules it
+imports and the assets it names. Entries are kept in
+.render_cache/scenes.json and re-parsed only when a file's mtime or size
+changes and its content hash no longer matches.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+
+from rendering.cache import CACHE_DIR, file_references
+
+INDEX_PATH = os.path.join(CACHE_DIR, "scenes.json")
+
+# Where render.py and the tooling look for scenes by default
+SCENE_ROOTS = ["main.py", "animations"]
+
+# Bump when the shape of a file entry changes
+INDEX_VERSION = 1
+
+
+def scene_files(path):
+    """The scene files of a file or package directory."""
+    if os.path.isdir(path):
+        return sorted(
+            os.path.normpath(os.path.join(path, name)) for name in os.listdir(path)
+            if name.endswith(".py") and not name.startswith("_")
+        )
+    return [os.path.normpath(path)]
+
+
+def scan_file(path, source=None):
+    """Parse a scene file into its index entry (without mtime and size)."""
+    if source is None:
+        with open(path, "rb") as f:
+            source = f.read()
+    tree = ast.parse(source, filename=path)
+
+    # A class is a scene if one of its bases is a Manim *Scene class
+    # or another scene defined earlier in the same file.
+    kinds = {}
+    scenes = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            name = base.attr if isinstance(base, ast.Attribute) else getattr(base, "id", "")
+            if name.endswith("Scene") or name in kinds:
+                kinds[node.name] = kinds.get(name, name)
+                scenes.append({"name": node.name, "base": name, "kind": kinds[node.name], "line": node.lineno})
+                break
+
+    helpers, assets = file_references(tree)
+    return {
+        "hash": hashlib.sha256(source).hexdigest(),
+        "scenes": scenes,
+        "helpers": sorted(set(helpers) - {os.path.normpath(path)}),
+        "assets": sorted(set(assets)),
+    }
+
+
+class SceneIndex:
+    """Cached scan of scene files, keyed by path.
+
+    Writes go through a temporary file and a rename, so a reader never sees
+    a half-written index; concurrent refreshes at worst redo each other's
+    parsing.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        return index["files"]
+
+    def save(self, files):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        files = {path: entry for path, entry in files.items() if os.path.exists(path)}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, "files": files}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def files(self, paths=SCENE_ROOTS):
+        """Up-to-date entries {path: entry} for the scene files under paths."""
+        if isinstance(paths, str):
+            paths = [paths]
+        files = self.load()
+        changed = False
+        entries = {}
+        for path in paths:
+            for file in scene_files(path):
+                stat = os.stat(file)
+                entry = files.get(file)
+                if entry is None or (entry["mtime"], entry["size"]) != (stat.st_mtime, stat.st_size):
+                    with open(file, "rb") as f:
+                        source = f.read()
+                    if entry is None or entry["hash"] != hashlib.sha256(source).hexdigest():
+                        entry = scan_file(file, source)
+                    entry = dict(entry, mtime=stat.st_mtime, size=stat.st_size)
+                    files[file] = entry
+                    changed = True
+                entries[file] = entry
+        if changed:
+            self.save(files)
+        return entries
+
+    def scenes(self, paths=SCENE_ROOTS):
+        """Every scene under paths as a dict with its file, name, base, kind,
+        line, helpers and assets, in file order."""
+        return [
+            dict(scene, file=file, helpers=entry["helpers"], assets=entry["assets"])
+            for file, entry in self.files(paths).items()
+            for scene in entry["scenes"]
+        ]
+
+    def find(self, name, paths=SCENE_ROOTS):
+        """The scenes called name under paths."""
+        return [scene for scene in self.scenes(paths) if scene["name"] == name]
+
+
+def print_scenes(scenes):
+    if not scenes:
+        print("No scenes found.")
+        return
+    width = max(len(scene["name"]) for scene in scenes)
+    for scene in scenes:
+        print(f"{scene['name']:<{width}}  {scene['kind']:<18} {scene['file']}:{scene['line']}")
+        for helper in scene["helpers"]:
+            print(f"{'':<{width}}    uses {helper}")
+        for asset in scene["assets"]:
+            print(f"{'':<{width}}    reads {asset}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the project's scenes without importing Manim.")
+    parser.add_argument("paths", nargs="*", default=SCENE_ROOTS, help="Scene files or package directories")
+    parser.add_argument("--json", action="store_true", help="Print the entries as JSON")
+    args = parser.parse_args()
+
+    scenes = SceneIndex().scenes(args.paths)
+    if args.json:
+        print(json.dumps(scenes, indent=2))
+    else:
+        print_scenes(scenes)
+
+
+if __name__ == "__main__":
+    main()
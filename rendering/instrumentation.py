@@ -0,0 +1,158 @@
+"""Per-play timing and mobject counts for a scene.
+
+    uv run python -m rendering.runner animations/warehouse_v3.py WarehouseOptimizationV3 --instrument
+    python render.py animations/warehouse_v3.py WarehouseOptimizationV3 --instrument
+
+With --instrument, the runner mixes InstrumentationMixin into the scene
+class it loads, so scene files never import it. Every play and wait is
+logged with its duration, the mobjects and Bezier points on screen as it
+starts, how many family members it interpolates and the wall time it took,
+and whether it was skipped or reused from Manim's partial movie cache;
+mobjects added or removed by construct since the previous play are counted
+on the next one. When construct is done the timeline goes to
+media/instrumentation/<output>.json, named after the movie being written,
+and the most expensive plays, plus the construct lines whose plays cost
+the most in total (e.g. a play inside a loop), are printed.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from rendering.metadata import screen_counts
+
+INSTRUMENTATION_DIR = os.path.join("media", "instrumentation")
+
+
+class InstrumentationMixin:
+    """Put before the scene's Manim class, or let the runner do it
+    (see instrumented())."""
+
+    # Plays and lines listed in the printed summary
+    instrumentation_top = 10
+
+    def play(self, *args, **kwargs):
+        if getattr(self, "_in_play", False):
+            return super().play(*args, **kwargs)
+        line = self._scene_line()
+        self._in_play = True
+        try:
+            on_screen = self.get_mobject_family_members()
+            start = self.time
+            wall_start = time.perf_counter()
+            super().play(*args, **kwargs)
+            wall = time.perf_counter() - wall_start
+        finally:
+            self._in_play = False
+
+        entries = self._instrumentation()
+        pending = self._pending_changes()
+        entries.append({
+            "index": len(entries),
+            "kind": "wait" if getattr(self, "_in_wait", False) else "play",
+            "animations": [type(animation).__name__ for animation in self.animations or []],
+            "line": line,
+            "start": start,
+            "duration": self.time - start,
+            "wall": wall,
+            "skipped": self.renderer.skip_animations,
+            # Cached plays are skipped too, but do have a hash
+            "cached": self.renderer.skip_animations and self.renderer.animations_hashes[-1] is not None,
+            **screen_counts(on_screen),
+            "interpolated": sum(len(animation.mobject.get_family()) for animation in self.animations or []),
+            "added": pending["added"],
+            "removed": pending["removed"],
+            "add_remove_wall": pending["wall"],
+        })
+        self._changes = None
+
+    def wait(self, *args, **kwargs):
+        self._in_wait = True
+        try:
+            return super().wait(*args, **kwargs)
+        finally:
+            self._in_wait = False
+
+    def add(self, *mobjects):
+        if getattr(self, "_in_play", False):
+            return super().add(*mobjects)
+        wall_start = time.perf_counter()
+        result = super().add(*mobjects)
+        pending = self._pending_changes()
+        pending["added"] += len(mobjects)
+        pending["wall"] += time.perf_counter() - wall_start
+        return result
+
+    def remove(self, *mobjects):
+        if getattr(self, "_in_play", False):
+            return super().remove(*mobjects)
+        wall_start = time.perf_counter()
+        result = super().remove(*mobjects)
+        pending = self._pending_changes()
+        pending["removed"] += len(mobjects)
+        pending["wall"] += time.perf_counter() - wall_start
+        return result
+
+    def tear_down(self):
+        super().tear_down()
+        entries = self._instrumentation()
+        output_name = getattr(self.renderer.file_writer, "output_name", None)
+        name = Path(output_name).stem if output_name else type(self).__name__
+        path = os.path.join(INSTRUMENTATION_DIR, f"{name}.json")
+        os.makedirs(INSTRUMENTATION_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(entries, f, indent=2)
+        self.print_instrumentation_summary(entries)
+        print(f"📈 Play timeline saved to {path}")
+
+    def print_instrumentation_summary(self, entries):
+        if not entries:
+            return
+        top = self.instrumentation_top
+        total = sum(entry["wall"] for entry in entries)
+        print(f"\n{type(self).__name__}: {len(entries)} plays, {total:.2f}s wall")
+
+        print(f"  Top {top} plays by wall time:")
+        for entry in sorted(entries, key=lambda entry: entry["wall"], reverse=True)[:top]:
+            names = ", ".join(entry["animations"]) or "-"
+            if entry["cached"]:
+                names += " (cached)"
+            print(f"   #{entry['index']:<4} line {entry['line']!s:<4} {entry['wall']:7.2f}s "
+                  f"({entry['duration']:5.2f}s scene)  {entry['mobjects']:>5} mobjects "
+                  f"{entry['points']:>8} points  {entry['interpolated']:>5} interpolated  {names}")
+
+        # Plays from one line of construct, e.g. inside a loop, add up
+        lines = defaultdict(lambda: {"plays": 0, "wall": 0.0})
+        for entry in entries:
+            lines[entry["line"]]["plays"] += 1
+            lines[entry["line"]]["wall"] += entry["wall"]
+        print(f"  Top {top} construct lines by total wall time:")
+        for line, stats in sorted(lines.items(), key=lambda item: item[1]["wall"], reverse=True)[:top]:
+            share = stats["wall"] / total if total else 0.0
+            print(f"   line {line!s:<4} {stats['wall']:7.2f}s over {stats['plays']} plays ({share:.0%})")
+
+    def _scene_line(self):
+        # The innermost line of the scene's own file, past wait/pause in Manim
+        scene_file = type(self).construct.__code__.co_filename
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename != scene_file:
+            frame = frame.f_back
+        return frame.f_lineno if frame is not None else None
+
+    def _instrumentation(self):
+        if getattr(self, "_instrumentation_entries", None) is None:
+            self._instrumentation_entries = []
+        return self._instrumentation_entries
+
+    def _pending_changes(self):
+        if getattr(self, "_changes", None) is None:
+            self._changes = {"added": 0, "removed": 0, "wall": 0.0}
+        return self._changes
+
+
+def instrumented(scene_class):
+    """scene_class with InstrumentationMixin mixed in, under the same name."""
+    return type(scene_class.__name__, (InstrumentationMixin, scene_class), {"__module__": scene_class.__module__})
@@ -0,0 +1,372 @@
+"""Persistent render queue backed by SQLite.
+
+render.py --queue adds jobs, and a worker drains them:
+
+    python render.py animations/ -q k --queue
+    uv run python -m rendering.jobs work
+    python render.py --queue-status
+
+Jobs survive crashes and restarts: a job left "running" by a worker that
+died is queued again the next time a worker starts. A failed render is
+retried with exponential backoff up to max_attempts times. Each job runs
+render.py in a process of its own, and the worker only starts one when a
+core and enough memory for its estimated peak RSS are free, so two 4K map
+renders are never started side by side on a machine that cannot hold both.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from rendering.profiling import HISTORY_PATH
+from rendering.quality import QUALITIES
+
+QUEUE_PATH = os.path.join("media", "render_queue.db")
+LOG_DIR = os.path.join("media", "logs", "queue")
+
+MAX_ATTEMPTS = 3
+
+# Seconds before the first retry; doubles with every further failure
+RETRY_BACKOFF = 30
+
+# Seconds between two scheduling passes of a worker
+POLL_INTERVAL = 1.0
+
+# Share of the memory available when the worker starts that jobs may reserve
+MEMORY_HEADROOM = 0.85
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file TEXT NOT NULL,
+    scene TEXT NOT NULL,
+    quality TEXT NOT NULL,
+    audio TEXT,
+    options TEXT NOT NULL DEFAULT '[]',
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    error TEXT,
+    log_path TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def available_memory_mb():
+    """Memory that can be used without swapping, or None if unknown."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+
+    # macOS: free, inactive and speculative pages can all be reclaimed
+    try:
+        output = subprocess.run(["vm_stat"], capture_output=True, text=True, check=True).stdout
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    pages = 0
+    for line in output.splitlines():
+        name, _, value = line.partition(":")
+        if name in ("Pages free", "Pages inactive", "Pages speculative"):
+            pages += int(value.strip().rstrip("."))
+    return pages * page_size / 1024 ** 2
+
+
+def memory_estimate_mb(scene, quality, history_path=HISTORY_PATH):
+    """Peak RSS to expect from rendering a scene at a quality.
+
+    Uses the highest peak of earlier profiled renders (render.py --profile)
+    of the same scene and quality, else the quality's default.
+    """
+    peak = 0.0
+    try:
+        with open(history_path, "r") as f:
+            for line in f:
+                report = json.loads(line)
+                if report["scene"] == scene and report["quality"] == quality:
+                    peak = max([peak] + [phase["peak_rss_mb"] for phase in report["phases"].values()])
+    except FileNotFoundError:
+        pass
+    return peak or QUALITIES[quality]["memory_mb"]
+
+
+class JobQueue:
+    """Render jobs in a SQLite database, safe to share between processes."""
+
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def submit(self, file, scene, quality="l", audio=None, options=(), priority=0, max_attempts=MAX_ATTEMPTS):
+        """Queue a render and return its job id.
+
+        options are extra render.py arguments (e.g. ["--single-pass"]). If the
+        same render is already waiting, it is kept and given the higher priority.
+        """
+        options = json.dumps(list(options))
+        now = time.time()
+        with self._connect() as db:
+            existing = db.execute(
+                "SELECT id FROM jobs WHERE file = ? AND scene = ? AND quality = ? AND audio IS ? AND options = ?"
+                " AND status IN ('queued', 'running')",
+                (file, scene, quality, audio, options)
+            ).fetchone()
+            if existing:
+                db.execute(
+                    "UPDATE jobs SET priority = MAX(priority, ?), updated = ? WHERE id = ?",
+                    (priority, now, existing["id"])
+                )
+                return existing["id"]
+            cursor = db.execute(
+                "INSERT INTO jobs (file, scene, quality, audio, options, priority, max_attempts, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (file, scene, quality, audio, options, priority, max_attempts, now, now)
+            )
+            return cursor.lastrowid
+
+    def jobs(self, statuses=None):
+        """List jobs as dicts, most urgent first."""
+        query = "SELECT * FROM jobs"
+        params = ()
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' * len(statuses))})"
+            params = tuple(statuses)
+        query += " ORDER BY status = 'done', priority DESC, id"
+        with self._connect() as db:
+            return [dict(row) for row in db.execute(query, params)]
+
+    def recover(self):
+        """Queue again the jobs whose worker died while they were running."""
+        with self._connect() as db:
+            running = db.execute("SELECT id, worker_pid FROM jobs WHERE status = 'running'").fetchall()
+            stale = [row["id"] for row in running if not (row["worker_pid"] and _pid_alive(row["worker_pid"]))]
+            db.executemany(
+                "UPDATE jobs SET status = 'queued', worker_pid = NULL, updated = ? WHERE id = ?",
+                [(time.time(), job_id) for job_id in stale]
+            )
+        return stale
+
+    def claim(self, fits):
+        """Mark the most urgent due job that fits(job) as running and return it.
+
+        Runs in one write transaction, so two workers never claim the same job.
+        """
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            candidates = db.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND next_attempt <= ? ORDER BY priority DESC, id",
+                (now,)
+            ).fetchall()
+            for row in candidates:
+                job = dict(row)
+                if fits(job):
+                    db.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker_pid = ?, updated = ?"
+                        " WHERE id = ?",
+                        (os.getpid(), now, job["id"])
+                    )
+                    job["attempts"] += 1
+                    return job
+        return None
+
+    def finish(self, job, error=None):
+        """Record the outcome of a claimed job, scheduling a retry on failure."""
+        now = time.time()
+        if error is None:
+            status, next_attempt = "done", 0
+        elif job["attempts"] < job["max_attempts"]:
+            status, next_attempt = "queued", now + RETRY_BACKOFF * 2 ** (job["attempts"] - 1)
+        else:
+            status, next_attempt = "failed", 0
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, next_attempt = ?, error = ?, worker_pid = NULL, updated = ?"
+                " WHERE id = ?",
+                (status, next_attempt, error, now, job["id"])
+            )
+        return status
+
+    def set_log(self, job, log_path):
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET log_path = ? WHERE id = ?", (log_path, job["id"]))
+
+    def retry(self, job_ids=None):
+        """Queue failed jobs again with a fresh set of attempts."""
+        query = (
+            "UPDATE jobs SET status = 'queued', attempts = 0, next_attempt = 0, error = NULL, updated = ?"
+            " WHERE status = 'failed'"
+        )
+        params = (time.time(),)
+        if job_ids:
+            query += f" AND id IN ({', '.join('?' * len(job_ids))})"
+            params += tuple(job_ids)
+        with self._connect() as db:
+            return db.execute(query, params).rowcount
+
+    def clear(self, statuses=("done",)):
+        with self._connect() as db:
+            return db.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(statuses))})", tuple(statuses)
+            ).rowcount
+
+
+def job_command(job):
+    """The render.py invocation that runs one job."""
+    cmd = [sys.executable, "render.py", job["file"], job["scene"], "--quality", job["quality"]]
+    if job["audio"]:
+        cmd += ["--audio", job["audio"]]
+    return cmd + json.loads(job["options"])
+
+
+def work(queue=None, max_jobs=None, memory_mb=None, drain=False):
+    """Run queued jobs as resources allow, until interrupted.
+
+    At most max_jobs renders (default: one per core) run at once, and their
+    memory estimates together stay within memory_mb (default: a share of
+    the memory available at start). One job always runs, even if its
+    estimate alone exceeds the budget. With drain, return once nothing is
+    queued or running.
+    """
+    queue = queue or JobQueue()
+    max_jobs = max_jobs or os.cpu_count() or 1
+    if memory_mb is None:
+        available = available_memory_mb()
+        memory_mb = available * MEMORY_HEADROOM if available else None
+
+    recovered = queue.recover()
+    if recovered:
+        print(f"♻️ Requeued {len(recovered)} jobs left running by a dead worker.")
+    print(f"👷 Worker {os.getpid()}: up to {max_jobs} jobs"
+          + (f" within {memory_mb / 1024:.1f} GB." if memory_mb else "."), flush=True)
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    running = {}  # job id -> (job, process, log file, memory estimate)
+    try:
+        while True:
+            for job_id, (job, process, log, _) in list(running.items()):
+                if process.poll() is None:
+                    continue
+                log.close()
+                error = None if process.returncode == 0 else f"render.py exited with {process.returncode}"
+                status = queue.finish(job, error)
+                icon = {"done": "✅", "queued": "🔁", "failed": "❌"}[status]
+                print(f"{icon} Job {job_id} {job['scene']} ({job['quality']}): {status}", flush=True)
+                del running[job_id]
+
+            reserved = sum(estimate for *_, estimate in running.values())
+
+            def fits(job):
+                if not running:
+                    return True
+                if memory_mb is None:
+                    return True
+                return reserved + memory_estimate_mb(job["scene"], job["quality"]) <= memory_mb
+
+            while len(running) < max_jobs:
+                job = queue.claim(fits)
+                if job is None:
+                    break
+                estimate = memory_estimate_mb(job["scene"], job["quality"])
+                reserved += estimate
+                log_path = os.path.join(LOG_DIR, f"{job['id']}_{job['scene']}.log")
+                queue.set_log(job, log_path)
+                log = open(log_path, "a")
+                log.write(f"\n=== Attempt {job['attempts']} at {time.ctime()} ===\n")
+                log.flush()
+                process = subprocess.Popen(job_command(job), stdout=log, stderr=subprocess.STDOUT)
+                running[job["id"]] = (job, process, log, estimate)
+                print(f"🎥 Job {job['id']} {job['scene']} ({job['quality']}), attempt {job['attempts']},"
+                      f" ~{estimate:.0f} MB", flush=True)
+
+            if drain and not running and not queue.jobs(("queued",)):
+                return
+            time.sleep(POLL_INTERVAL)
+    finally:
+        # Leave interrupted jobs to be requeued by the next worker
+        for job, process, log, _ in running.values():
+            process.terminate()
+            log.close()
+
+
+def print_status(queue=None):
+    jobs = (queue or JobQueue()).jobs()
+    if not jobs:
+        print("The render queue is empty.")
+        return
+    print(f"{'ID':>4}  {'STATUS':<8} {'PRI':>3}  {'TRY':<5} {'QUALITY':<7} SCENE")
+    for job in jobs:
+        tries = f"{job['attempts']}/{job['max_attempts']}"
+        line = f"{job['id']:>4}  {job['status']:<8} {job['priority']:>3}  {tries:<5} {job['quality']:<7} {job['scene']}"
+        if job["status"] == "queued" and job["next_attempt"] > time.time():
+            line += f"  (retry in {job['next_attempt'] - time.time():.0f}s)"
+        if job["error"] and job["status"] != "done":
+            line += f"  {job['error']}, see {job['log_path']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Work through the persistent render queue.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    work_parser = subparsers.add_parser("work", help="Run queued jobs as resources allow")
+    work_parser.add_argument("--jobs", "-j", type=int, help="Maximum renders at once (default: number of cores)")
+    work_parser.add_argument("--memory", type=float, help="Memory budget for renders in GB (default: most of what is free)")
+    work_parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+    subparsers.add_parser("status", help="List jobs")
+    retry_parser = subparsers.add_parser("retry", help="Queue failed jobs again")
+    retry_parser.add_argument("ids", nargs="*", type=int, help="Job ids (default: every failed job)")
+    subparsers.add_parser("clear", help="Forget finished jobs")
+
+    args = parser.parse_args()
+    queue = JobQueue()
+    if args.command == "work":
+        try:
+            work(queue, args.jobs, args.memory * 1024 if args.memory else None, args.drain)
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "status":
+        print_status(queue)
+    elif args.command == "retry":
+        print(f"🔁 Requeued {queue.retry(args.ids)} jobs.")
+    elif args.command == "clear":
+        print(f"🧹 Removed {queue.clear()} finished jobs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Review a scene from the end state of every play instead of a video.
+
+    python render.py animations/lhc_collision.py LHCCollision --keyframes
+
+The runner runs construct with every animation skipped, as for the timing
+pass of segments.py, and rasterizes one frame per play once it has ended.
+The frames go to media/keyframes/<Scene>/NNN.png and are tiled, with the
+play number, end time and animation names, into
+media/keyframes/<Scene>_contact.png.
+"""
+
+import math
+import os
+
+KEYFRAME_DIR = os.path.join("media", "keyframes")
+
+# Contact sheet layout, in pixels
+THUMB_WIDTH = 384
+LABEL_HEIGHT = 22
+MARGIN = 8
+COLUMNS = 4
+
+
+def keyframe_dir(scene, root=KEYFRAME_DIR):
+    return os.path.join(root, scene)
+
+
+def contact_sheet_path(directory):
+    return os.path.normpath(directory) + "_contact.png"
+
+
+def contact_sheet(paths, labels, output, columns=COLUMNS, thumb_width=THUMB_WIDTH):
+    """Tile keyframe images, each above its label, into one image at output."""
+    from PIL import Image, ImageDraw
+
+    columns = max(1, min(columns, len(paths)))
+    rows = math.ceil(len(paths) / columns)
+    with Image.open(paths[0]) as first:
+        thumb_height = round(first.height * thumb_width / first.width)
+    cell_width = thumb_width + MARGIN
+    cell_height = thumb_height + LABEL_HEIGHT + MARGIN
+
+    sheet = Image.new("RGB", (columns * cell_width + MARGIN, rows * cell_height + MARGIN), "#202020")
+    draw = ImageDraw.Draw(sheet)
+    for i, (path, label) in enumerate(zip(paths, labels)):
+        x = MARGIN + (i % columns) * cell_width
+        y = MARGIN + (i // columns) * cell_height
+        with Image.open(path) as image:
+            thumb = image.convert("RGB").resize((thumb_width, thumb_height), Image.LANCZOS)
+        sheet.paste(thumb, (x, y))
+        draw.text((x, y + thumb_height + 4), label, fill="#e0e0e0")
+    sheet.save(output)
+    return output
+
+
+def keyframe_label(entry):
+    """Caption of a play in the contact sheet, from its timeline entry."""
+    minutes, seconds = divmod(entry["start"] + entry["duration"], 60)
+    names = ", ".join(entry["animations"]) or "-"
+    return f"#{entry['index']:03d}  {int(minutes)}:{seconds:04.1f}  {names}"
+
+
+def keyframes_command(file, scene, quality="l", directory=None):
+    """Runner command writing the keyframes of a scene to directory."""
+    return [
+        "uv", "run", "python", "-m", "rendering.runner",
+        file, scene, "--quality", quality, "--keyframes", directory or keyframe_dir(scene)
+    ]
@@ -0,0 +1,209 @@
+"""Fill Manim's TeX cache in a few batched LaTeX runs before rendering.
+
+    uv run python -m rendering.latex animations/holt_winters.py animations/lhc_collision.py
+
+Every MathTex or Tex that misses Manim's cache starts its own LaTeX and
+dvisvgm process, and on a cold render of an equation-heavy scene process
+startup is most of the TeX time. This pass finds the MathTex, Tex and
+SingleStringMathTex calls with literal arguments in the scene files. It asks
+Manim which TeX documents they need by building them against a placeholder
+SVG, and it compiles the missing ones as pages of a few multi-page documents
+(one LaTeX run and one dvisvgm run each), in parallel. Each page becomes the
+<hash>.svg that Manim would have written, so the render finds them cached.
+
+Expressions built at run time (f-strings, variables) and custom TeX
+templates are left to Manim. So is any batch that fails to compile, so a
+TeX error is still reported against the expression that caused it.
+"""
+
+import argparse
+import ast
+import math
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from rendering.discovery import SCENE_ROOTS, scene_files
+
+TEX_CLASSES = ("MathTex", "Tex", "SingleStringMathTex")
+
+# Fewer expressions than this per batch and the LaTeX startup saved is small
+MIN_BATCH = 8
+
+# Class option that gives every standalone environment a cropped page of its own
+STANDALONE_CLASS = r"\documentclass[preview]{standalone}"
+MULTI_PAGE_CLASS = r"\documentclass[preview,multi]{standalone}"
+
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10">'
+    '<path d="M0 0 L10 0 L10 10 Z"/></svg>'
+)
+
+
+def tex_calls(file):
+    """(class name, args, kwargs) of the TeX mobjects a file builds from literals."""
+    with open(file, "r") as f:
+        tree = ast.parse(f.read(), filename=file)
+
+    calls = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        name = node.func.attr if isinstance(node.func, ast.Attribute) else getattr(node.func, "id", "")
+        if name not in TEX_CLASSES:
+            continue
+        try:
+            args = [ast.literal_eval(arg) for arg in node.args]
+            kwargs = {}
+            for keyword in node.keywords:
+                if keyword.arg in (None, "tex_template"):
+                    raise ValueError("not the default template")
+                if keyword.arg in ("arg_separator", "tex_environment", "substrings_to_isolate"):
+                    kwargs[keyword.arg] = ast.literal_eval(keyword.value)
+                elif keyword.arg == "tex_to_color_map" and isinstance(keyword.value, ast.Dict):
+                    # Only the keys change how the string is split up
+                    keys = [ast.literal_eval(key) for key in keyword.value.keys]
+                    kwargs.setdefault("substrings_to_isolate", [])
+                    kwargs["substrings_to_isolate"] = list(kwargs["substrings_to_isolate"]) + keys
+        except ValueError:
+            continue
+        if args and all(isinstance(arg, str) for arg in args):
+            calls.append((name, args, kwargs))
+    return calls
+
+
+def tex_requests(calls):
+    """The (expression, environment) pairs Manim compiles for calls, in order."""
+    import manim
+    import manim.mobject.text.tex_mobject as tex_mobject
+
+    requests = []
+    original = tex_mobject.tex_to_svg_file
+    fd, placeholder = tempfile.mkstemp(suffix=".svg")
+    with os.fdopen(fd, "w") as f:
+        f.write(PLACEHOLDER_SVG)
+
+    def record(expression, environment=None, tex_template=None):
+        requests.append((expression, environment))
+        return placeholder
+
+    tex_mobject.tex_to_svg_file = record
+    try:
+        for name, args, kwargs in calls:
+            try:
+                getattr(manim, name)(*args, **kwargs)
+            except Exception:
+                # Whatever failed here fails the same way in the render
+                continue
+    finally:
+        tex_mobject.tex_to_svg_file = original
+        os.remove(placeholder)
+    return list(dict.fromkeys(requests))
+
+
+def tex_code(template, expression, environment):
+    if environment is not None:
+        return template.get_texcode_for_expression_in_env(expression, environment)
+    return template.get_texcode_for_expression(expression)
+
+
+def svg_path(template, expression, environment):
+    """Where Manim looks for the compiled expression."""
+    from manim import config
+    from manim.utils.tex_file_writing import tex_hash
+
+    return config.get_dir("tex_dir") / f"{tex_hash(tex_code(template, expression, environment))}.svg"
+
+
+def batch_document(template, requests):
+    """One document with a page per (expression, environment), or None if the
+    template cannot be split into pages."""
+    prefix, _, suffix = template.body.partition(template.placeholder_text)
+    if STANDALONE_CLASS not in prefix:
+        return None
+    pages = []
+    for expression, environment in requests:
+        code = tex_code(template, expression, environment)
+        pages.append(code[len(prefix):len(code) - len(suffix)])
+    body = "".join(f"\\begin{{standalone}}\n{page}\n\\end{{standalone}}\n" for page in pages)
+    return prefix.replace(STANDALONE_CLASS, MULTI_PAGE_CLASS, 1) + body + suffix
+
+
+def compile_batch(template, requests):
+    """Compile requests in one LaTeX and one dvisvgm run into Manim's TeX
+    cache. Returns how many were compiled (0 if the batch failed)."""
+    from manim import config
+    from manim.utils.tex_file_writing import make_tex_compilation_command, tex_hash
+
+    document = batch_document(template, requests)
+    if document is None:
+        return 0
+    tex_dir = config.get_dir("tex_dir")
+    tex_dir.mkdir(parents=True, exist_ok=True)
+    name = f"batch_{tex_hash(document)}"
+    tex_file = tex_dir / f"{name}.tex"
+    tex_file.write_text(document, encoding="utf-8")
+    output = tex_file.with_suffix(template.output_format)
+    digits = len(str(len(requests)))
+    pages = [tex_dir / f"{name}-{i + 1:0{digits}d}.svg" for i in range(len(requests))]
+
+    try:
+        command = make_tex_compilation_command(template.tex_compiler, template.output_format, tex_file, tex_dir)
+        if subprocess.run(command, stdout=subprocess.DEVNULL).returncode != 0:
+            return 0
+        subprocess.run([
+            "dvisvgm",
+            *(["--pdf"] if template.output_format == ".pdf" else []),
+            "--page=1-", "--no-fonts", "--verbosity=0",
+            f"--output={(tex_dir / f'{name}-%{digits}p.svg').as_posix()}",
+            output.as_posix(),
+        ], stdout=subprocess.DEVNULL)
+        # A page count that does not match means the pages cannot be told apart
+        extra = tex_dir / f"{name}-{len(requests) + 1:0{digits}d}.svg"
+        if not all(page.exists() for page in pages) or extra.exists():
+            return 0
+        for page, (expression, environment) in zip(pages, requests):
+            os.replace(page, svg_path(template, expression, environment))
+        return len(requests)
+    finally:
+        for path in tex_dir.glob(f"{name}*"):
+            path.unlink(missing_ok=True)
+
+
+def precompile(files, workers=None):
+    """Compile the TeX of every scene file that Manim's cache is missing.
+
+    Returns (expressions found, already cached, compiled now).
+    """
+    from manim import config
+
+    template = config["tex_template"]
+    calls = [call for file in files for call in tex_calls(file)]
+    requests = tex_requests(calls)
+    missing = [request for request in requests if not svg_path(template, *request).exists()]
+    if not missing:
+        return len(requests), len(requests), 0
+
+    workers = workers or os.cpu_count() or 1
+    size = max(MIN_BATCH, math.ceil(len(missing) / workers))
+    batches = [missing[i:i + size] for i in range(0, len(missing), size)]
+    with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+        compiled = sum(pool.map(lambda batch: compile_batch(template, batch), batches))
+    return len(requests), len(requests) - len(missing), compiled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompile the TeX of scene files into Manim's cache.")
+    parser.add_argument("paths", nargs="*", default=SCENE_ROOTS, help="Scene files or package directories")
+    parser.add_argument("--workers", "-j", type=int, help="LaTeX runs at once (default: number of cores)")
+    args = parser.parse_args()
+
+    files = [file for path in args.paths for file in scene_files(path)]
+    found, cached, compiled = precompile(files, args.workers)
+    print(f"✒️ TeX: {found} expressions, {cached} already cached, {compiled} compiled"
+          + (f", {found - cached - compiled} left to Manim" if found - cached - compiled else ""))
+
+
+if __name__ == "__main__":
+    main()
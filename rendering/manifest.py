@@ -0,0 +1,63 @@
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+
+MANIFEST_PATH = os.path.join("media", "render_manifest.json")
+
+
+def manifest_key(module, scene, quality):
+    return f"{module}:{scene}:{quality}"
+
+
+class Manifest:
+    """Index of rendered videos, keyed by (module, scene, quality).
+
+    Each entry records scene, module, quality, fps, path, duration and
+    input_hash, plus audio_path once the audio has been muxed. Writers
+    take a file lock, so parallel batch workers can share one manifest.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def lookup(self, module, scene, quality):
+        """Return the entry for a render whose video still exists, or None."""
+        entry = self.load().get(manifest_key(module, scene, quality))
+        if entry is None or not os.path.exists(entry["path"]):
+            return None
+        return entry
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def update(self, module, scene, quality, **fields):
+        """Create or update one entry and return it."""
+        key = manifest_key(module, scene, quality)
+        with self._locked():
+            entries = self.load()
+            entry = entries.get(key, {"scene": scene, "module": module, "quality": quality})
+            entry.update(fields)
+            entry["updated"] = time.time()
+            entries[key] = entry
+
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        return entry
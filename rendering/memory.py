@@ -0,0 +1,245 @@
+"""Memory-bounded rendering of long scenes, with an audit of live mobjects.
+
+    python render.py animations/lhc_collision.py LHCCollision -q k --memory-audit
+
+Long scenes keep state alive after it leaves the screen: images that were
+faded out, transform targets, TracedPaths still running their updaters.
+With the audit installed, after every play the runner records the mobjects
+on screen with the memory of their points and image pixels. When the
+scene starts, at each next_section() and at the end it also takes a census
+of every Mobject still alive and the process RSS, and prints what grew
+over each section. The report goes to media/memory/<Scene>_<q>.json.
+
+The pixels of an ImageMobject that has been removed from the scene (e.g.
+after a FadeOut) are spilled to disk. The image is left in place, and its
+pixels are read back the first time anything touches them again, whether
+that is a render, a set_opacity or a copy, and before any play that shows
+or animates the image, so that play hashes the same as without the audit.
+Points are not spilled: they are small next to images, and animations keep
+touching removed vector mobjects.
+"""
+
+import copy
+import gc
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import weakref
+
+from rendering.cache import CACHE_DIR
+
+MEMORY_DIR = os.path.join("media", "memory")
+SPILL_DIR = os.path.join(CACHE_DIR, "spill")
+
+# Images smaller than this stay in memory when they leave the screen
+SPILL_MIN_BYTES = 1024 ** 2
+
+MB = 1024 ** 2
+
+
+def current_rss_mb():
+    """Resident set size of this process now, or its peak where that is unknown."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (FileNotFoundError, ValueError, OSError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+def mobject_bytes(mob):
+    """(points, pixels) bytes held by one mobject, not counting its family."""
+    points = getattr(mob, "points", None)
+    pixels = mob.__dict__.get("pixel_array")
+    return (points.nbytes if points is not None else 0, pixels.nbytes if pixels is not None else 0)
+
+
+def family_usage(mobjects):
+    points = pixels = 0
+    for mob in mobjects:
+        mob_points, mob_pixels = mobject_bytes(mob)
+        points += mob_points
+        pixels += mob_pixels
+    return {"mobjects": len(mobjects), "points_mb": points / MB, "pixels_mb": pixels / MB}
+
+
+def census():
+    """Every Mobject alive in the process, with the memory it holds."""
+    from manim import Mobject
+
+    gc.collect()
+    return family_usage([obj for obj in gc.get_objects() if isinstance(obj, Mobject)])
+
+
+# Subclasses of image classes whose pixel_array loads back from disk
+_spilled_classes = {}
+
+# Spill file of every spilled image. Kept out of the mobject's __dict__,
+# which Manim hashes to look up cached partial movies.
+_spill_paths = weakref.WeakKeyDictionary()
+
+
+def load_pixels(mob):
+    """Read a spilled image's pixels back and make it a plain image again."""
+    import numpy as np
+
+    mob.__class__ = mob._unspilled_class
+    mob.pixel_array = np.load(_spill_paths.pop(mob))
+    return mob.pixel_array
+
+
+def is_spilled(mob):
+    return mob in _spill_paths
+
+
+def _spilled_class(cls):
+    if cls not in _spilled_classes:
+        def set_pixels(mob, value):
+            mob.__class__ = cls
+            _spill_paths.pop(mob, None)
+            mob.pixel_array = value
+
+        def deepcopy(mob, memo):
+            # A copy is about to be used, so it gets the pixels
+            load_pixels(mob)
+            return copy.deepcopy(mob, memo)
+
+        def shallow_copy(mob):
+            load_pixels(mob)
+            return copy.copy(mob)
+
+        _spilled_classes[cls] = type(cls.__name__, (cls,), {
+            "_unspilled_class": cls,
+            "pixel_array": property(load_pixels, set_pixels),
+            "__deepcopy__": deepcopy,
+            "__copy__": shallow_copy,
+        })
+    return _spilled_classes[cls]
+
+
+def spill_pixels(mob, directory):
+    """Move an image's pixels to directory until something reads them.
+    Returns the bytes freed."""
+    import numpy as np
+
+    pixels = mob.__dict__.pop("pixel_array")
+    fd, path = tempfile.mkstemp(suffix=".npy", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, pixels)
+    _spill_paths[mob] = path
+    mob.__class__ = _spilled_class(type(mob))
+    return pixels.nbytes
+
+
+class MemoryAudit:
+    """Per-play memory timeline and per-section census of one scene."""
+
+    def __init__(self, scene, spill=True, spill_dir=SPILL_DIR):
+        self.scene = scene
+        self.spill = spill
+        self.spill_dir = os.path.join(spill_dir, str(os.getpid()))
+        self.plays = []
+        self.sections = []
+        self.spilled_mb = 0.0
+        self._on_screen = {}
+
+    def install(self):
+        renderer = self.scene.renderer
+        file_writer = renderer.file_writer
+        original_play = renderer.play
+        original_next_section = file_writer.next_section
+
+        def play(scene, *args, **kwargs):
+            self.before_play(args)
+            original_play(scene, *args, **kwargs)
+            self.after_play()
+
+        def next_section(*args, **kwargs):
+            self.take_census(file_writer.sections[-1].name)
+            original_next_section(*args, **kwargs)
+
+        renderer.play = play
+        file_writer.next_section = next_section
+        self.take_census("start")
+        return self
+
+    def before_play(self, args):
+        """Load the pixels of spilled images that this play shows or animates,
+        before Manim hashes it."""
+        from manim import Mobject
+
+        mobjects = list(self.scene.get_mobject_family_members())
+        for arg in args:
+            # Animations and .animate builders both keep their mobject there
+            mob = getattr(arg, "mobject", arg)
+            if isinstance(mob, Mobject):
+                mobjects.extend(mob.get_family())
+        for mob in mobjects:
+            if is_spilled(mob):
+                load_pixels(mob)
+
+    def after_play(self):
+        from manim import ImageMobject
+
+        scene = self.scene
+        family = scene.get_mobject_family_members()
+        on_screen = {id(mob): mob for mob in family}
+        removed = [mob for key, mob in self._on_screen.items() if key not in on_screen]
+        self._on_screen = on_screen
+
+        freed = 0
+        if self.spill:
+            for mob in removed:
+                if isinstance(mob, ImageMobject) and mob.__dict__.get("pixel_array") is not None \
+                        and mob.pixel_array.nbytes >= SPILL_MIN_BYTES:
+                    os.makedirs(self.spill_dir, exist_ok=True)
+                    freed += spill_pixels(mob, self.spill_dir)
+        self.spilled_mb += freed / MB
+
+        self.plays.append(dict(
+            family_usage(family),
+            index=len(self.plays),
+            time=scene.renderer.time,
+            section=scene.renderer.file_writer.sections[-1].name,
+            with_updaters=sum(1 for mob in family if mob.updaters),
+            removed=len(removed),
+            spilled_mb=freed / MB,
+        ))
+
+    def take_census(self, name):
+        """Census labelled with the section that ends here (or "start")."""
+        entry = dict(census(), section=name, play=len(self.plays), rss_mb=current_rss_mb())
+        entry["on_screen"] = self.plays[-1]["mobjects"] if self.plays else 0
+        self.sections.append(entry)
+
+    def finish(self, path):
+        """Take the final census, write the report to path and drop the spill files."""
+        self.take_census(self.scene.renderer.file_writer.sections[-1].name)
+        self._on_screen = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"plays": self.plays, "sections": self.sections, "spilled_mb": self.spilled_mb}, f, indent=2)
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+        return path
+
+
+def report_path(scene, quality, directory=MEMORY_DIR):
+    return os.path.join(directory, f"{scene}_{quality}.json")
+
+
+def print_memory_report(audit):
+    print(f"🧠 Memory by section ({audit.spilled_mb:.0f} MB of image pixels spilled to disk)")
+    print(f"   {'SECTION':<24} {'LIVE':>7} {'ON SCR':>7} {'POINTS':>9} {'PIXELS':>9} {'RSS':>9}  GROWTH")
+    previous = None
+    for entry in audit.sections:
+        growth = ""
+        if previous:
+            growth = (f"{entry['mobjects'] - previous['mobjects']:+d} mobjects, "
+                      f"{entry['points_mb'] + entry['pixels_mb'] - previous['points_mb'] - previous['pixels_mb']:+.1f} MB data, "
+                      f"{entry['rss_mb'] - previous['rss_mb']:+.0f} MB RSS")
+        print(f"   {entry['section']:<24} {entry['mobjects']:>7} {entry['on_screen']:>7} "
+              f"{entry['points_mb']:>7.1f}MB {entry['pixels_mb']:>7.1f}MB {entry['rss_mb']:>7.0f}MB  {growth}")
+        previous = entry
@@ -0,0 +1,148 @@
+"""Sidecar metadata written next to every rendered video.
+
+<video>.meta.json holds what the runner already knows when the render
+finishes: duration, frame count, fps, resolution and the frame range of every
+animation. The audio and post-processing stages read it instead of probing
+the video again.
+"""
+
+import json
+import os
+
+
+def sidecar_path(video):
+    return os.path.splitext(video)[0] + ".meta.json"
+
+
+def screen_counts(mobjects):
+    """Mobject family members on screen and their Bezier points, as recorded
+    for every play by runner.record_timeline and the scene instrumentation."""
+    return {"mobjects": len(mobjects), "points": sum(len(mob.points) for mob in mobjects)}
+
+
+def frame_count(path):
+    """Number of video frames in a file, from its container header (no decode)."""
+    import av
+
+    with av.open(str(path)) as container:
+        return container.streams.video[0].frames
+
+
+def is_constant_rate(path, fps):
+    """Whether a file stores one frame per 1/fps of its duration, from its header."""
+    import av
+
+    with av.open(str(path)) as container:
+        stream = container.streams.video[0]
+        if stream.duration is None or not stream.frames:
+            return True
+        return round(stream.duration * stream.time_base * fps) == stream.frames
+
+
+def decoded_frames(path, fps, pixel_format="rgba"):
+    """Decode a movie into one pixel array per 1/fps.
+
+    Frames are placed by their timestamps, so a frame stored once and shown
+    for longer (variable frame rate) is repeated for as long as it is shown.
+    """
+    import av
+
+    with av.open(str(path)) as container:
+        stream = container.streams.video[0]
+        total = round(stream.duration * stream.time_base * fps) if stream.duration else 0
+        previous = None
+        first = shown = 0
+        for av_frame in container.decode(stream):
+            position = round(av_frame.time * fps)
+            if previous is None:
+                first = position
+            while shown < position - first:
+                yield previous
+                shown += 1
+            previous = av_frame.to_ndarray(format=pixel_format)
+        if previous is not None:
+            yield previous
+            shown += 1
+            while shown < total:
+                yield previous
+                shown += 1
+
+
+def scene_metadata(scene, timeline=None):
+    """Build the sidecar for a rendered scene from its partial movie files.
+
+    timeline is the list filled by runner.record_timeline; when given, each
+    animation also lists the classes that were played, its hash and whether
+    it came from Manim's partial movie cache.
+    """
+    from manim import config
+
+    fps = config.frame_rate
+    # Frames the writer counted as it wrote; partial movies reused from the
+    # cache are read from their headers
+    counts = getattr(scene.renderer.file_writer, "frame_counts", {})
+    entries = {entry["index"]: entry for entry in timeline or []}
+    animations = []
+    frame = 0
+    for index, path in enumerate(scene.renderer.file_writer.partial_movie_files):
+        # Skipped animations (outside a --from/--upto range) leave None here
+        if path is None:
+            continue
+        frames = counts.get(str(path)) or frame_count(path)
+        entry = entries.get(index, {})
+        animations.append({
+            "index": index,
+            "animations": entry.get("animations", []),
+            "hash": entry.get("hash"),
+            "cached": entry.get("cached", False),
+            "start_frame": frame,
+            "frames": frames,
+            "start": frame / fps,
+            "duration": frames / fps,
+        })
+        frame += frames
+
+    return {
+        "scene": type(scene).__name__,
+        "duration": frame / fps,
+        "frame_count": frame,
+        "fps": fps,
+        "width": config.pixel_width,
+        "height": config.pixel_height,
+        "animations": animations,
+    }
+
+
+def write_sidecar(video, metadata):
+    path = sidecar_path(video)
+    with open(path, "w") as f:
+        json.dump(metadata, f, indent=2)
+    return path
+
+
+def read_sidecar(video):
+    """Return the sidecar of a video, or None if it has none or is older than it."""
+    path = sidecar_path(video)
+    if not os.path.exists(path) or not os.path.exists(video):
+        return None
+    if os.path.getmtime(path) < os.path.getmtime(video):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def merge_sidecars(metadatas):
+    """Combine the sidecars of consecutive segments into one for the joined video."""
+    merged = dict(metadatas[0], animations=[], duration=0.0, frame_count=0)
+    for metadata in metadatas:
+        offset = merged["frame_count"]
+        for animation in metadata["animations"]:
+            start_frame = animation["start_frame"] + offset
+            merged["animations"].append(dict(
+                animation,
+                start_frame=start_frame,
+                start=start_frame / merged["fps"],
+            ))
+        merged["frame_count"] += metadata["frame_count"]
+    merged["duration"] = merged["frame_count"] / merged["fps"]
+    return merged
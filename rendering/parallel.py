@@ -0,0 +1,160 @@
+"""Rasterize the frames of one animation on a pool of worker processes.
+
+Segments split a scene between animations, which does nothing for a single
+long, heavy play such as Create(assignment_lines) over every zone. With
+frame workers, each Cairo play forks a pool once its animations have begun:
+every worker starts from a copy-on-write snapshot of the scene, interpolates
+its own contiguous runs of frames and rasterizes them, and the frames go
+back to the encoder in order as they arrive. At most IN_FLIGHT_BYTES of
+frames are requested at a time, and the writer queue holds as many more,
+so the frames waiting for the encoder stay bounded at any resolution. The
+writer thread is drained and stopped while the pool forks, so no thread is
+inside the encoder at that moment. The main process then jumps to the end
+of the animation and finishes it as usual.
+
+Only plays whose frames depend on time alone are split: nothing with live
+updaters (they integrate dt from frame to frame), no Succession (it begins
+its parts as it reaches them) and no wait_until conditions. Other plays,
+and plays shorter than MIN_PARALLEL_FRAMES, render serially. Forking needs
+a POSIX system; elsewhere every play renders serially.
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+from collections import deque
+from queue import Queue
+
+from rendering import profiling
+
+# Below this many frames, forking the pool costs more than it saves
+MIN_PARALLEL_FRAMES = 24
+
+# Frames per task: small enough to balance the workers, large enough that
+# each task is worth a round trip
+CHUNK_FRAMES = 4
+
+# Tasks requested ahead per worker, so none of them waits for the next one
+BATCH_CHUNKS = 2
+
+# Memory of the frames requested but not yet given to the encoder
+IN_FLIGHT_BYTES = 1024 ** 3
+
+# The scene being rendered, inherited by the forked workers
+_scene = None
+
+
+def _render_frames(times):
+    frames = []
+    for t in times:
+        _scene.update_to_time(t)
+        _scene.renderer.update_frame(_scene, _scene.moving_mobjects)
+        frames.append(_scene.renderer.get_frame())
+    return frames
+
+
+def _write_frames(scene, frames):
+    for frame in frames:
+        scene.renderer.add_frame(frame)
+        scene.time_progression.update(1)
+
+
+def in_flight_window(workers, frame_bytes):
+    """(frames per task, tasks in flight) for frames of frame_bytes each."""
+    frames = max(workers, IN_FLIGHT_BYTES // frame_bytes)
+    chunk = max(1, min(CHUNK_FRAMES, frames // (workers * BATCH_CHUNKS)))
+    return chunk, max(workers, min(workers * BATCH_CHUNKS, frames // chunk))
+
+
+def _stop_writer(file_writer):
+    """Encode the frames already queued and stop the writer thread, if one runs."""
+    thread = getattr(file_writer, "writer_thread", None)
+    if thread is None or not thread.is_alive():
+        return False
+    file_writer.queue.put((-1, None))
+    thread.join()
+    return True
+
+
+def _start_writer(file_writer, max_frames=0):
+    """Start a writer thread on a new queue; with max_frames, adding a frame
+    to a full queue waits for the encoder."""
+    file_writer.queue = Queue(maxsize=max_frames)
+    file_writer.writer_thread = threading.Thread(target=file_writer.listen_and_write, args=())
+    file_writer.writer_thread.start()
+
+
+def can_split(scene, frames):
+    """Whether a play that has begun can be rendered on frame workers."""
+    from manim import config
+    from manim.animation.composition import Succession
+    from manim.constants import RendererType
+
+    return (
+        frames >= MIN_PARALLEL_FRAMES
+        and config.renderer == RendererType.CAIRO
+        and scene.stop_condition is None
+        and not scene.updaters
+        and not any(mob.updaters for mob in scene.get_mobject_family_members())
+        and not any(isinstance(animation, Succession) for animation in scene.animations)
+    )
+
+
+def install_frame_workers(scene, workers=None):
+    """Render the long plays of a constructed scene on `workers` processes
+    (default: one per core). Call after any file writer swap."""
+    from manim import config
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return
+    workers = workers or os.cpu_count() or 1
+    if workers < 2:
+        return
+    original_play_internal = scene.play_internal
+
+    def play_internal(skip_rendering=False):
+        global _scene
+
+        renderer = scene.renderer
+        if skip_rendering or scene.skip_animation_preview or renderer.skip_animations:
+            return original_play_internal(skip_rendering)
+        duration = scene.get_run_time(scene.animations)
+        if not can_split(scene, math.ceil(duration * config.frame_rate)):
+            return original_play_internal(skip_rendering)
+        scene.duration = duration
+        scene.time_progression = scene._get_animation_time_progression(scene.animations, duration)
+        times = list(scene.time_progression.iterable)
+
+        chunk, window = in_flight_window(workers, config.pixel_width * config.pixel_height * 4)
+        chunks = [times[i:i + chunk] for i in range(0, len(times), chunk)]
+        _scene = scene
+        writer_stopped = _stop_writer(renderer.file_writer)
+        try:
+            with profiling.phase("parallel rasterize", children=True):
+                pool = multiprocessing.get_context("fork").Pool(min(workers, len(chunks)))
+                if writer_stopped:
+                    _start_writer(renderer.file_writer, chunk * window)
+                    writer_stopped = False
+                with pool:
+                    pending = deque()
+                    for task in chunks:
+                        if len(pending) == window:
+                            _write_frames(scene, pending.popleft().get())
+                        pending.append(pool.apply_async(_render_frames, (task,)))
+                    while pending:
+                        _write_frames(scene, pending.popleft().get())
+        finally:
+            _scene = None
+            if writer_stopped:
+                _start_writer(renderer.file_writer)
+
+        scene.update_to_time(times[-1])
+        for animation in scene.animations:
+            animation.finish()
+            animation.clean_up_from_scene(scene)
+        scene.update_mobjects(0)
+        renderer.static_image = None
+        scene.time_progression.close()
+
+    scene.play_internal = play_internal
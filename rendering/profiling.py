@@ -0,0 +1,154 @@
+"""Per-phase render telemetry: wall time, CPU time and peak RSS.
+
+Profiling is process-wide. start() installs a recorder, and phase() blocks
+anywhere in the pipeline record into it (they cost nothing when no recorder
+is active). render.py records its own phases (input hash, Manim subprocess,
+ffprobe, ffmpeg mux). The runner records the phases inside Manim (construct,
+rasterize, encode, combine) and render.py merges them in under "manim/".
+
+Phases may nest or overlap (encoding runs on Manim's writer thread while
+construct is still rasterizing), so they are not meant to add up to the
+total.
+"""
+
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_DIR = os.path.join("media", "profiles")
+HISTORY_PATH = os.path.join(PROFILE_DIR, "history.jsonl")
+
+_recorder = None
+
+
+def _peak_rss_mb(who):
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class PhaseRecorder:
+    """Accumulates calls, wall time, CPU time and peak RSS per phase name."""
+
+    def __init__(self):
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, wall, cpu, peak_rss_mb):
+        with self._lock:
+            phase = self.phases.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak_rss_mb": 0.0})
+            phase["calls"] += 1
+            phase["wall"] += wall
+            phase["cpu"] += cpu
+            phase["peak_rss_mb"] = max(phase["peak_rss_mb"], peak_rss_mb)
+
+    def merge(self, phases, prefix=""):
+        with self._lock:
+            for name, phase in phases.items():
+                self.phases[prefix + name] = phase
+
+
+def start():
+    """Start recording phases in this process and return the recorder."""
+    global _recorder
+    _recorder = PhaseRecorder()
+    return _recorder
+
+
+def stop():
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def active():
+    return _recorder is not None
+
+
+def merge_phases(phases, prefix=""):
+    """Add phases recorded in another process, e.g. the runner's report."""
+    if _recorder is not None:
+        _recorder.merge(phases, prefix)
+
+
+@contextmanager
+def phase(name, children=False):
+    """Record a block as a phase.
+
+    CPU time is this thread's, or with children=True that of the child
+    processes waited on inside the block (e.g. a subprocess.run). Peak RSS is
+    the high-water mark of this process at the end of the block. With
+    children=True it is the largest child's RSS if a child waited on inside
+    the block set a new high-water mark, else 0: getrusage only keeps the
+    largest child so far, so a small child after a large one (ffprobe after
+    Manim) cannot be measured.
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    wall_start = time.perf_counter()
+    if children:
+        before = resource.getrusage(who)
+        peak_before = _peak_rss_mb(who)
+    else:
+        cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        peak = _peak_rss_mb(who)
+        if children:
+            after = resource.getrusage(who)
+            cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+            if peak <= peak_before:
+                peak = 0.0
+        else:
+            cpu = time.thread_time() - cpu_start
+        recorder.add(name, wall, cpu, peak)
+
+
+def timed(name, func):
+    """Wrap a callable so each call is recorded as a phase."""
+    def wrapped(*args, **kwargs):
+        with phase(name):
+            return func(*args, **kwargs)
+    return wrapped
+
+
+def instrument_scene(scene):
+    """Record construct, frame rasterization, encoding and the final concat of
+    a constructed scene. Call after any file writer swap."""
+    renderer = scene.renderer
+    file_writer = renderer.file_writer
+    scene.construct = timed("construct", scene.construct)
+    renderer.update_frame = timed("rasterize", renderer.update_frame)
+    file_writer.encode_and_write_frame = timed("encode", file_writer.encode_and_write_frame)
+    file_writer.combine_to_movie = timed("combine", file_writer.combine_to_movie)
+
+
+def write_report(scene, quality, recorder, directory=PROFILE_DIR):
+    """Write a JSON report for one render and append it to the history file."""
+    os.makedirs(directory, exist_ok=True)
+    report = {
+        "scene": scene,
+        "quality": quality,
+        "time": time.time(),
+        "host": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "phases": recorder.phases,
+    }
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{scene}_{quality}_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    with open(os.path.join(directory, os.path.basename(HISTORY_PATH)), "a") as f:
+        f.write(json.dumps(report) + "\n")
+    return path
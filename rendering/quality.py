@@ -0,0 +1,29 @@
+import os
+
+# Manim quality presets, keyed by the render.py --quality letter.
+# "name" is the Manim config value, and "height" and "fps" name its output
+# folder (see quality_dir).
+# "memory_mb" is a rough peak RSS of one render, used by the job queue until
+# a profiled render of the scene gives a real figure.
+QUALITIES = {
+    "l": {"name": "low_quality", "height": 480, "fps": 15, "memory_mb": 1024},
+    "m": {"name": "medium_quality", "height": 720, "fps": 30, "memory_mb": 1536},
+    "h": {"name": "high_quality", "height": 1080, "fps": 60, "memory_mb": 3072},
+    "k": {"name": "fourk_quality", "height": 2160, "fps": 60, "memory_mb": 8192},
+}
+
+
+def quality_dir(quality):
+    """Name of Manim's output folder for a quality, e.g. 480p15."""
+    preset = QUALITIES[quality]
+    return f"{preset['height']}p{preset['fps']}"
+
+
+def module_name(file):
+    """Manim names output folders after the stem of the scene file."""
+    return os.path.splitext(os.path.basename(file))[0]
+
+
+def video_path(file, scene, quality, media_dir="media"):
+    """Where Manim writes a scene: media/videos/<module>/<quality dir>/<Scene>.mp4."""
+    return os.path.join(media_dir, "videos", module_name(file), quality_dir(quality), f"{scene}.mp4")
@@ -0,0 +1,41 @@
+"""Renderer selection, including OpenGL on headless CPU-only machines.
+
+Manim's OpenGL renderer first tries a standalone GLX context and falls back
+to EGL, which needs no display. On a box without a GPU, Mesa's llvmpipe
+driver rasterizes on all cores; headless_gl_env() points Mesa at it before
+the context is created. Scenes built on MovingCameraScene use Cairo-only
+camera features and do not render with OpenGL.
+"""
+
+import os
+import sys
+
+RENDERERS = ("cairo", "opengl")
+
+
+def headless_gl_env(software=None):
+    """Environment variables for an OpenGL context without a display.
+
+    software forces Mesa's multi-threaded llvmpipe rasterizer; by default it
+    is used whenever there is no display to get a hardware context from.
+    """
+    env = {}
+    headless = sys.platform.startswith("linux") and not os.environ.get("DISPLAY")
+    if headless:
+        env["PYOPENGL_PLATFORM"] = "egl"
+        env["EGL_PLATFORM"] = "surfaceless"
+    if software if software is not None else headless:
+        env["LIBGL_ALWAYS_SOFTWARE"] = "1"
+        env["GALLIUM_DRIVER"] = "llvmpipe"
+        env["LP_NUM_THREADS"] = str(os.cpu_count() or 1)
+    return env
+
+
+def configure_renderer(renderer, software=None):
+    """Prepare this process for a renderer; call before Manim creates a context.
+
+    Variables already set by the user win.
+    """
+    if renderer == "opengl":
+        for name, value in headless_gl_env(software).items():
+            os.environ.setdefault(name, value)
@@ -0,0 +1,382 @@
+"""Render a scene inside this interpreter instead of through the manim CLI.
+
+Used by render.py for modes that need hooks into Manim's pipeline:
+
+    uv run python -m rendering.runner animations/lhc_collision.py LHCCollision -q h --audio assets/ambient.mp3
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import shutil
+from pathlib import Path
+
+from rendering import profiling
+from rendering.metadata import screen_counts
+from rendering.quality import QUALITIES
+from rendering.renderers import RENDERERS, configure_renderer
+from rendering.seeding import scene_seed
+
+# Manim deletes the oldest partial movies beyond this many (its default is
+# 100), which would stop long scenes from ever fully hitting the cache
+MAX_FILES_CACHED = 1000
+
+
+# Scene modules already imported in this interpreter: path -> (mtime, module)
+_modules = {}
+
+
+def load_scene_class(file, scene):
+    """Import a scene file the way the manim CLI does and return the Scene class.
+
+    The module is imported once per interpreter and reused for every scene it
+    holds, until the file changes or forget_modules() is called.
+    """
+    from manim.utils.module_ops import get_module
+
+    path = os.path.abspath(file)
+    mtime = os.path.getmtime(path)
+    cached = _modules.get(path)
+    if cached and cached[0] == mtime:
+        module = cached[1]
+    else:
+        module = get_module(Path(file))
+        _modules[path] = (mtime, module)
+    if not hasattr(module, scene):
+        raise ValueError(f"{scene} is not in {file}")
+    return getattr(module, scene)
+
+
+def forget_modules():
+    """Re-import scene modules on their next use, e.g. after a helper changed."""
+    _modules.clear()
+
+
+def record_timeline(instance, hash_plays=False):
+    """Record every play/wait of a scene as it runs.
+
+    Returns a list that fills with {index, start, duration, cut_ok, animations,
+    hash, cached, section, section_name, mobjects, points} entries, where
+    animations names the classes played, cached tells whether Manim reused
+    the partial movie with that hash, section numbers the scene's
+    next_section() calls, and mobjects and points count the mobject family
+    members and their points on screen as the play starts.
+    Skipped animations have no hash, unless hash_plays computes it the way
+    Manim would have.
+    cut_ok is False when updaters were live as the animation started, since
+    fast-forwarding to that point would not reproduce their state.
+    """
+    renderer = instance.renderer
+    file_writer = renderer.file_writer
+    timeline = []
+    original_play = renderer.play
+    hashes = []
+
+    if hash_plays:
+        from manim.utils.hashing import get_hash_from_play_call
+
+        original_add = file_writer.add_partial_movie_file
+
+        # Called once the play's animations are compiled, before they begin
+        def add_partial_movie_file(hash_animation):
+            with profiling.phase("hash"):
+                hashes.append(hash_animation or get_hash_from_play_call(
+                    instance, renderer.camera, instance.animations, instance.mobjects
+                ))
+            original_add(hash_animation)
+
+        file_writer.add_partial_movie_file = add_partial_movie_file
+
+    def play(scene, *args, **kwargs):
+        family = scene.get_mobject_family_members()
+        live_updaters = bool(scene.updaters) or any(mob.updaters for mob in family)
+        start = renderer.time
+        original_play(scene, *args, **kwargs)
+        # Skipped animations get no hash; cached ones are skipped too
+        animation_hash = renderer.animations_hashes[-1]
+        cached = animation_hash is not None and renderer.skip_animations
+        if hash_plays:
+            animation_hash = hashes[-1]
+        sections = renderer.file_writer.sections
+        timeline.append({
+            "index": len(timeline),
+            "start": start,
+            "duration": renderer.time - start,
+            "cut_ok": not live_updaters,
+            "animations": [type(animation).__name__ for animation in scene.animations or []],
+            "hash": animation_hash,
+            "cached": cached,
+            "section": len(sections) - 1,
+            "section_name": sections[-1].name,
+            **screen_counts(family),
+        })
+
+    renderer.play = play
+    return timeline
+
+
+def render(file, scene, quality="l", audio=None, from_animation=None, upto_animation=None, output_name=None,
+           stream=None, stream_audio=None, stream_duration=None, renderer="cairo", disable_caching=False,
+           hold_frames=True, frame_workers=None, memory_audit=False, instrument=False):
+    """Render one scene and return the path of the written movie.
+
+    A <movie>.meta.json sidecar with duration, frame count, fps, resolution
+    and animation boundaries is written next to the movie. With audio, the
+    final <Scene>_Audio.mp4 is written in a single pass with the music bed
+    muxed in. from_animation/upto_animation render only that
+    inclusive range of animations into <output_name>.mp4, using a partial
+    movie directory of its own so parallel ranges never share one.
+    With stream, frames are also encoded to an HLS playlist in that directory
+    as they are rendered, with stream_audio muxed in (see rendering.streaming).
+    renderer is "cairo" or "opengl" (see rendering.renderers).
+    disable_caching renders every animation even if a partial movie exists.
+    hold_frames converts runs of identical frames once (see rendering.writers).
+    frame_workers rasterizes the frames of long plays on that many processes
+    (0: one per core; see rendering.parallel).
+    memory_audit spills the pixels of removed images to disk and reports
+    live mobject memory per section (see rendering.memory).
+    instrument logs the timing and mobject counts of every play (see
+    rendering.instrumentation).
+    """
+    configure_renderer(renderer)
+    with profiling.phase("import manim"):
+        from manim import config, tempconfig
+        from rendering.metadata import scene_metadata, write_sidecar
+        from rendering.writers import (
+            AudioMuxFileWriter,
+            HoldFrameFileWriter,
+            StreamingAudioMuxFileWriter,
+            StreamingFileWriter,
+            install_file_writer,
+        )
+        from rendering.parallel import install_frame_workers
+        from rendering.memory import MemoryAudit, print_memory_report, report_path
+        from rendering.instrumentation import instrumented
+
+    options = {
+        "quality": QUALITIES[quality]["name"],
+        "input_file": file,
+        "write_to_movie": True,
+        "preview": False,
+        "max_files_cached": MAX_FILES_CACHED,
+        "renderer": renderer,
+        "disable_caching": disable_caching,
+    }
+    if from_animation is not None:
+        options["from_animation_number"] = from_animation
+    if upto_animation is not None:
+        options["upto_animation_number"] = upto_animation
+    if output_name:
+        options["output_file"] = output_name
+        options["partial_movie_dir"] = f"{{video_dir}}/partial_movie_files/{output_name}"
+
+    previous_renderer = config.renderer
+    try:
+        with tempconfig(options):
+            with profiling.phase("import scene"):
+                scene_class = load_scene_class(file, scene)
+            if instrument:
+                scene_class = instrumented(scene_class)
+            instance = scene_class(random_seed=scene_seed(scene))
+            if stream:
+                install_file_writer(instance, StreamingAudioMuxFileWriter if audio else StreamingFileWriter)
+            elif audio:
+                install_file_writer(instance, AudioMuxFileWriter)
+            else:
+                install_file_writer(instance, HoldFrameFileWriter)
+            # Set on the instance, so the next scene in this interpreter starts clean
+            writer = instance.renderer.file_writer
+            writer.hold_frames = hold_frames
+            if audio:
+                writer.audio = audio
+            if stream:
+                writer.stream_dir = stream
+                writer.stream_audio = stream_audio
+                writer.stream_duration = stream_duration
+            if profiling.active():
+                profiling.instrument_scene(instance)
+            if frame_workers is not None:
+                install_frame_workers(instance, frame_workers)
+            audit = MemoryAudit(instance).install() if memory_audit else None
+            timeline = record_timeline(instance)
+            instance.render()
+            if audit:
+                path = audit.finish(report_path(scene, quality))
+                print_memory_report(audit)
+                print(f"🧠 Memory report saved to {path}")
+
+            movie = str(instance.renderer.file_writer.movie_file_path)
+            with profiling.phase("metadata"):
+                metadata = scene_metadata(instance, timeline)
+                write_sidecar(movie, metadata)
+            print_cache_report(metadata)
+            return movie
+    finally:
+        # tempconfig restores the value but not the Mobject base classes that
+        # the renderer setter swaps, so set it again on the way out
+        if renderer != previous_renderer.value:
+            config.renderer = previous_renderer
+
+
+def print_cache_report(metadata):
+    """Print which animations were reused from Manim's partial movie cache."""
+    animations = metadata["animations"]
+    reused = sum(animation["cached"] for animation in animations)
+    print(f"♻️ Partial movie cache: {reused}/{len(animations)} animations reused")
+    for animation in animations:
+        status = "hit " if animation["cached"] else "miss"
+        names = ", ".join(animation["animations"]) or "-"
+        print(f"   {status} #{animation['index']:<3} {animation['duration']:6.2f}s  {names}")
+
+
+def timeline(file, scene, quality="l", hash_plays=False):
+    """Run construct with every animation skipped and return its timeline.
+
+    Frame drawing is stubbed out (Manim would still draw one frame per
+    skipped play) and nothing is encoded, so this costs little more than
+    building the mobjects. With hash_plays every entry also gets the hash
+    of its play (see record_timeline), which costs a serialization of
+    the scene per play.
+    """
+    from manim import tempconfig
+
+    options = {
+        "quality": QUALITIES[quality]["name"],
+        "input_file": file,
+        "write_to_movie": False,
+        "preview": False,
+    }
+    with tempconfig(options):
+        scene_class = load_scene_class(file, scene)
+        instance = scene_class(random_seed=scene_seed(scene))
+        instance.renderer._original_skipping_status = True
+        instance.renderer.update_frame = lambda *args, **kwargs: None
+        if profiling.active():
+            profiling.instrument_scene(instance)
+        entries = record_timeline(instance, hash_plays=hash_plays)
+        instance.render()
+        return entries
+
+
+def keyframes(file, scene, quality="l", directory=None):
+    """Save the end state of every play of a scene as a PNG, plus a contact
+    sheet of them all (see rendering.keyframes), and return the PNG paths.
+
+    Animations are skipped as in timeline(), and only one frame per play is
+    rasterized.
+    """
+    from manim import tempconfig
+    from rendering.keyframes import contact_sheet, contact_sheet_path, keyframe_dir, keyframe_label
+
+    directory = directory or keyframe_dir(scene)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    options = {
+        "quality": QUALITIES[quality]["name"],
+        "input_file": file,
+        "write_to_movie": False,
+        "preview": False,
+    }
+    with tempconfig(options):
+        scene_class = load_scene_class(file, scene)
+        instance = scene_class(random_seed=scene_seed(scene))
+        renderer = instance.renderer
+        renderer._original_skipping_status = True
+        entries = record_timeline(instance)
+
+        # Skipped plays still rasterize their single step; only the end
+        # state is wanted, so draw nothing until the play is over
+        update_frame = renderer.update_frame
+        renderer.update_frame = lambda *args, **kwargs: None
+        timed_play = renderer.play
+        paths = []
+
+        def play(scene, *args, **kwargs):
+            timed_play(scene, *args, **kwargs)
+            # A frozen wait leaves its (here undrawn) background behind
+            renderer.static_image = None
+            update_frame(scene)
+            path = os.path.join(directory, f"{len(paths):03d}.png")
+            renderer.camera.get_image().save(path)
+            paths.append(path)
+
+        renderer.play = play
+        instance.render()
+
+    if paths:
+        sheet = contact_sheet(paths, [keyframe_label(entry) for entry in entries], contact_sheet_path(directory))
+        print(f"🖼️ {len(paths)} keyframes in {directory}, contact sheet at {sheet}")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a Manim scene in-process.")
+    parser.add_argument("file", help="Path to the python file containing the Scene")
+    parser.add_argument("scene", help="Name of the Scene class to render")
+    parser.add_argument("--quality", "-q", default="l", choices=list(QUALITIES))
+    parser.add_argument("--audio", "-a", help="Mux this music bed during the render")
+    parser.add_argument("--from-animation", type=int, help="First animation to render")
+    parser.add_argument("--upto-animation", type=int, help="Last animation to render (inclusive)")
+    parser.add_argument("--output-name", help="Movie name to write instead of the scene name")
+    parser.add_argument("--renderer", default="cairo", choices=RENDERERS, help="Manim renderer to use")
+    parser.add_argument("--disable-caching", action="store_true", help="Ignore Manim's partial movie cache")
+    parser.add_argument("--no-hold-frames", dest="hold_frames", action="store_false",
+                        help="Convert every frame of a hold for the encoder instead of reusing the first")
+    parser.add_argument("--frame-workers", type=int, nargs="?", const=0, metavar="N",
+                        help="Rasterize the frames of long plays on N processes (default: one per core)")
+    parser.add_argument("--memory-audit", action="store_true",
+                        help="Spill removed images to disk and report live mobject memory per section")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Log the timing and mobject counts of every play to media/instrumentation")
+    parser.add_argument("--stream", metavar="DIR", help="Also write a progressive HLS playlist to this directory")
+    parser.add_argument("--stream-audio", help="Music bed to mux into the HLS segments")
+    parser.add_argument("--stream-duration", type=float, help="Expected duration, for the fade of the streamed audio")
+    parser.add_argument("--timeline", metavar="JSON",
+                        help="Only run construct and write the animation timeline to this file")
+    parser.add_argument("--hash", action="store_true",
+                        help="With --timeline, also hash every play the way Manim's partial movie cache does")
+    parser.add_argument("--keyframes", metavar="DIR",
+                        help="Only save the end state of every play to this directory, plus a contact sheet")
+    parser.add_argument("--profile", metavar="JSON", help="Write per-phase telemetry to this file")
+    parser.add_argument("--profile-python", metavar="PROF", help="Write a cProfile dump of the render to this file")
+
+    args = parser.parse_args()
+    recorder = profiling.start() if args.profile else None
+    if args.timeline:
+        with profiling.phase("timeline"):
+            entries = timeline(args.file, args.scene, args.quality, args.hash)
+        with open(args.timeline, "w") as f:
+            json.dump(entries, f, indent=2)
+        write_profile(recorder, args.profile)
+        return
+    if args.keyframes:
+        keyframes(args.file, args.scene, args.quality, args.keyframes)
+        return
+
+    profiler = cProfile.Profile() if args.profile_python else None
+    if profiler:
+        profiler.enable()
+
+    with profiling.phase("render"):
+        render(
+            args.file, args.scene, args.quality, args.audio,
+            args.from_animation, args.upto_animation, args.output_name,
+            args.stream, args.stream_audio, args.stream_duration, args.renderer, args.disable_caching,
+            args.hold_frames, args.frame_workers, args.memory_audit, args.instrument
+        )
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile_python)
+    write_profile(recorder, args.profile)
+
+
+def write_profile(recorder, path):
+    if recorder:
+        with open(path, "w") as f:
+            json.dump(recorder.phases, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Re-render only the sections of a scene that changed.
+
+Scenes mark their parts with self.next_section(name) (see the PART banners
+of lhc_collision.py). A timing pass runs construct without rasterizing and
+hashes every play the way Manim does for its partial movie cache: the hash
+covers the camera, the animations and every mobject on screen as the play
+starts. A section's key is the hash of its plays' hashes and of the render
+pipeline (cache.environment_hash), so it changes when the section's code
+changes, when it starts from a different state (e.g. a label added in an
+earlier section is still on screen) or when the pipeline that writes it
+changes.
+
+Finished section videos are kept in .render_cache/sections under their key.
+Missing sections are rendered as animation ranges in parallel, as in
+segments.py, and all sections are joined with a stream-copy concat. A
+section that starts while updaters are live cannot be rendered on its own
+and is folded into the one before it.
+"""
+
+import hashlib
+import os
+import shutil
+import time
+
+from rendering.cache import CACHE_DIR, environment_hash
+from rendering.metadata import merge_sidecars, read_sidecar, sidecar_path, write_sidecar
+from rendering.quality import video_path
+from rendering.segments import concat_segments, read_timeline, render_ranges
+
+SECTION_CACHE_DIR = os.path.join(CACHE_DIR, "sections")
+
+
+def plan_sections(timeline, quality):
+    """Group a hashed timeline into sections of [{name, first, last, key}]."""
+    sections = []
+    for entry in timeline:
+        if sections and (entry["section"] == sections[-1]["section"] or not entry["cut_ok"]):
+            sections[-1]["last"] = entry["index"]
+            sections[-1]["hashes"].append(entry["hash"])
+            continue
+        sections.append({
+            "section": entry["section"],
+            "name": entry["section_name"],
+            "first": entry["index"],
+            "last": entry["index"],
+            "hashes": [entry["hash"]],
+        })
+
+    # Sections written by another version of the pipeline must not be joined
+    # with new ones, so the key covers it as the render cache's does
+    environment = environment_hash()
+    for section in sections:
+        hashes = section.pop("hashes")
+        section["key"] = hashlib.sha256(f"{environment}:{quality}:{':'.join(hashes)}".encode()).hexdigest()
+    return sections
+
+
+def section_path(key, cache_dir=SECTION_CACHE_DIR):
+    return os.path.join(cache_dir, f"{key}.mp4")
+
+
+def render_sections(file, scene, quality, log_path=None, cache_dir=SECTION_CACHE_DIR, workers=None):
+    """Render a scene from cached and freshly rendered sections (at most
+    `workers` runners at a time) into Manim's usual output path and return
+    that path."""
+    timeline = read_timeline(file, scene, quality, log_path, hash_plays=True)
+    sections = plan_sections(timeline, quality)
+    if not sections:
+        raise ValueError(f"{scene} plays no animations")
+    dirty = [section for section in sections if read_sidecar(section_path(section["key"], cache_dir)) is None]
+    print(f"🧱 {scene}: {len(sections) - len(dirty)}/{len(sections)} sections cached, "
+          f"rendering {', '.join(section['name'] for section in dirty) or 'nothing'}")
+
+    if dirty:
+        # Name the ranges after their sections, so Manim's partial movie cache
+        # still helps inside a section that changed
+        names = [f"{scene}_{section['section']:02d}_{section['name']}" for section in dirty]
+        ranges = [(section["first"], section["last"]) for section in dirty]
+        paths = render_ranges(file, scene, quality, ranges, names, log_path, workers=workers)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for section, path in zip(dirty, paths):
+            cached = section_path(section["key"], cache_dir)
+            os.replace(path, cached)
+            os.replace(sidecar_path(path), sidecar_path(cached))
+
+    paths = [section_path(section["key"], cache_dir) for section in sections]
+    for path in paths:
+        os.utime(path)
+        os.utime(sidecar_path(path))
+
+    output = video_path(file, scene, quality)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    if len(paths) == 1:
+        shutil.copyfile(paths[0], output)
+    else:
+        concat_segments(paths, output)
+    write_sidecar(output, merge_sidecars([read_sidecar(path) for path in paths]))
+    return output
+
+
+def evict_sections(max_age, cache_dir=SECTION_CACHE_DIR):
+    """Drop section videos no render has used for longer than max_age seconds."""
+    if not os.path.isdir(cache_dir):
+        return []
+    evicted = []
+    now = time.time()
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith(".mp4") and now - os.path.getmtime(path) > max_age:
+            os.remove(path)
+            try:
+                os.remove(sidecar_path(path))
+            except FileNotFoundError:
+                pass
+            evicted.append(name)
+    return evicted
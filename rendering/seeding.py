@@ -0,0 +1,22 @@
+"""Deterministic random state for every scene.
+
+Manim names each partial movie after a hash of the play call, mobjects
+included, so a scene that draws from an unseeded RNG (np.random.choice in
+WarehouseOptimizationV3, random_color() in LHCCollision) builds different
+mobjects on every run and never reuses its partial movie cache. The runner
+constructs every scene with random_seed=scene_seed(...), which seeds both
+`random` and `np.random` before construct runs.
+
+Scenes that seed themselves (np.random.seed(42)) keep doing so; the seed
+here only fixes what they left unseeded.
+"""
+
+import zlib
+
+# Bump to re-roll the random choices of every scene at once
+PROJECT_SEED = 0
+
+
+def scene_seed(scene, project_seed=PROJECT_SEED):
+    """Stable 32-bit seed for a scene, the same in every process and run."""
+    return zlib.crc32(f"{project_seed}:{scene}".encode())
@@ -0,0 +1,155 @@
+"""Render one scene as contiguous animation ranges in parallel workers.
+
+A cheap timing pass (construct only, no frame drawn) lists every
+play/wait with its duration. The scene is then cut into ranges of roughly
+equal length. Each range is rendered by its own runner process with Manim's
+from/upto animation numbers, at most one process per core at a time, and
+the pieces are joined with a stream-copy concat. The segments' metadata sidecars are merged into one for the result.
+
+Every worker runs the whole construct and skips animations outside its
+range, so mobject state at a cut is the same as in a serial render. The one
+exception is updaters that integrate dt, such as TracedPath trails: a
+skipped animation advances them in one step instead of frame by frame. The
+timing pass therefore marks animations that start with live updaters, and
+the planner never cuts before them. Scenes must also seed any randomness
+used in construct, or each worker builds a different scene.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from rendering.metadata import merge_sidecars, read_sidecar, sidecar_path, write_sidecar
+from rendering.quality import video_path
+
+# Below this many seconds per segment, a worker's extra construct pass costs
+# more than the frames it saves
+MIN_SEGMENT_DURATION = 2.0
+
+
+def plan_segments(timeline, segments):
+    """Split a timeline into at most `segments` contiguous (first, last) ranges
+    of similar duration, cutting only before animations marked cut_ok."""
+    if not timeline:
+        return []
+    total = sum(entry["duration"] for entry in timeline)
+    target = max(total / max(1, segments), MIN_SEGMENT_DURATION)
+
+    ranges = []
+    first = 0
+    elapsed = 0.0
+    for entry in timeline:
+        index = entry["index"]
+        if (
+            index > first
+            and entry["cut_ok"]
+            and elapsed >= target * (len(ranges) + 1)
+            and len(ranges) < segments - 1
+        ):
+            ranges.append((first, index - 1))
+            first = index
+        elapsed += entry["duration"]
+    ranges.append((first, timeline[-1]["index"]))
+    return ranges
+
+
+def read_timeline(file, scene, quality, log_path=None, hash_plays=False):
+    """Run the runner's timing pass and return its timeline, with the hash
+    of every play if hash_plays."""
+    fd, timeline_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        cmd = [
+            "uv", "run", "python", "-m", "rendering.runner",
+            file, scene, "--quality", quality, "--timeline", timeline_path
+        ]
+        if hash_plays:
+            cmd.append("--hash")
+        _run(cmd, log_path)
+        with open(timeline_path, "r") as f:
+            return json.load(f)
+    finally:
+        os.remove(timeline_path)
+
+
+def concat_segments(paths, output):
+    """Join segment videos without re-encoding."""
+    fd, list_path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w") as f:
+        for path in paths:
+            f.write(f"file '{os.path.abspath(path)}'\n")
+    try:
+        subprocess.run([
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "concat", "-safe", "0",
+            "-i", list_path,
+            "-c", "copy",
+            output
+        ], check=True)
+    finally:
+        os.remove(list_path)
+    return output
+
+
+def _render_range(cmd, log_path=None):
+    if log_path is None:
+        subprocess.run(cmd, check=True)
+        return
+    with open(log_path, "w") as log:
+        subprocess.run(cmd, check=True, stdout=log, stderr=subprocess.STDOUT)
+
+
+def render_ranges(file, scene, quality, ranges, names, log_path=None, workers=None):
+    """Render inclusive (first, last) animation ranges in runner processes,
+    at most `workers` at a time (default: one per core), each into
+    <name>.mp4 next to the scene's usual output, and return their paths."""
+    output_dir = os.path.dirname(video_path(file, scene, quality))
+    paths = []
+    jobs = []
+    for (first, last), name in zip(ranges, names):
+        paths.append(os.path.join(output_dir, f"{name}.mp4"))
+        cmd = [
+            "uv", "run", "python", "-m", "rendering.runner",
+            file, scene, "--quality", quality,
+            "--from-animation", str(first), "--upto-animation", str(last),
+            "--output-name", name
+        ]
+        jobs.append((cmd, f"{os.path.splitext(log_path)[0]}.{name}.log" if log_path else None))
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_range, cmd, range_log) for cmd, range_log in jobs]
+    for future in futures:
+        if future.exception() is not None:
+            raise future.exception()
+    return paths
+
+
+def render_segmented(file, scene, quality, segments, log_path=None, workers=None):
+    """Render a scene as parallel animation ranges (at most `workers` runners
+    at a time) into Manim's usual output path and return that path."""
+    timeline = read_timeline(file, scene, quality, log_path)
+    ranges = plan_segments(timeline, segments)
+    print(f"🧩 Splitting {scene} ({len(timeline)} animations) into {len(ranges)} segments...")
+
+    names = [f"{scene}_seg{i:03d}" for i in range(len(ranges))]
+    segment_paths = render_ranges(file, scene, quality, ranges, names, log_path, workers)
+
+    output = video_path(file, scene, quality)
+    concat_segments(segment_paths, output)
+    write_sidecar(output, merge_sidecars([read_sidecar(path) for path in segment_paths]))
+    for path in segment_paths:
+        os.remove(path)
+        os.remove(sidecar_path(path))
+    return output
+
+
+def _run(cmd, log_path=None):
+    if log_path:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with open(log_path, "a") as log:
+            subprocess.run(cmd, check=True, stdout=log, stderr=subprocess.STDOUT)
+    else:
+        subprocess.run(cmd, check=True)
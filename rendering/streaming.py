@@ -0,0 +1,63 @@
+"""Progressive HLS output, playable while the scene is still rendering.
+
+With render.py --stream, the runner sends every frame to an ffmpeg process
+that writes two-second fMP4 segments and an event playlist to
+media/streams/<Scene>/index.m3u8, with the music bed muxed into each segment.
+Players that understand live HLS (Safari, VLC, ffplay) can open the playlist
+once the first segment exists and keep playing as new ones arrive. The
+usual MP4 is still written at the end.
+
+The fade needs the final duration before the render ends, so the previous
+render's duration is used when there is one; otherwise the stream has no
+fade (the MP4 still gets it).
+"""
+
+import os
+
+from rendering.audio import SAMPLE_RATE, bed_filter
+
+STREAM_DIR = os.path.join("media", "streams")
+
+# Seconds per HLS segment: how long the player waits before it can start
+SEGMENT_DURATION = 2
+
+
+def stream_dir(scene, root=STREAM_DIR):
+    return os.path.join(root, scene)
+
+
+def playlist_path(directory):
+    return os.path.join(directory, "index.m3u8")
+
+
+def hls_command(directory, width, height, fps, audio=None, duration=None):
+    """ffmpeg command reading raw RGBA frames on stdin and writing HLS to directory."""
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps),
+        "-i", "pipe:0",
+    ]
+    if audio:
+        cmd += ["-i", audio]
+    cmd += [
+        "-map", "0:v",
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+        # A keyframe at every segment boundary, so segments are cut on time
+        "-force_key_frames", f"expr:gte(t,n_forced*{SEGMENT_DURATION})",
+    ]
+    if audio:
+        cmd += [
+            "-map", "1:a",
+            "-af", f"{bed_filter(audio, duration)},aresample={SAMPLE_RATE}",
+            "-c:a", "aac", "-b:a", "192k",
+            "-shortest",
+        ]
+    cmd += [
+        "-f", "hls",
+        "-hls_time", str(SEGMENT_DURATION),
+        "-hls_playlist_type", "event",
+        "-hls_segment_type", "fmp4",
+        "-hls_segment_filename", os.path.join(directory, "segment_%05d.m4s"),
+        playlist_path(directory),
+    ]
+    return cmd
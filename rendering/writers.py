@@ -0,0 +1,227 @@
+"""Scene file writers used by rendering.runner in place of Manim's default.
+
+HoldFrameFileWriter, which the others build on, converts a run of identical
+frames to the encoder's pixel format once and gives the encoder copies of
+the converted planes, one per frame, so partial movies keep a constant frame
+rate and concatenate like Manim's own. Manim already rasterizes a static
+wait once and asks for N copies of it; waits with updaters that leave the
+picture unchanged are caught by comparing each frame with the one before.
+The writer also records how many frames each partial movie got
+(``frame_counts``), so the sidecar does not read them back from the files.
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import av
+import numpy as np
+from manim import __version__, config, logger
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import is_gif_format, modify_atime
+
+from rendering.audio import FADE_DURATION, cached_audio_bed
+from rendering.metadata import decoded_frames, frame_count, is_constant_rate
+from rendering.streaming import hls_command, playlist_path
+
+# Pixel format of Manim's mp4 partial movies, the one holds are converted to
+HELD_PIX_FMT = "yuv420p"
+
+
+def install_file_writer(scene, writer_class):
+    """Swap the file writer of a constructed scene.
+
+    Scene.__init__ always builds a plain SceneFileWriter. Re-running
+    init_scene with another class keeps the scene's renderer and camera
+    (e.g. MovingCamera) untouched.
+    """
+    scene.renderer._file_writer_class = writer_class
+    scene.renderer.init_scene(scene)
+
+
+def partial_movies_duration(partial_movie_files, frame_counts=None):
+    """Exact length of the concatenated partial movies, from the frames
+    counted while writing them or else from their container headers."""
+    frame_counts = frame_counts or {}
+    frames = sum(frame_counts.get(str(path)) or frame_count(path) for path in partial_movie_files)
+    return frames / config.frame_rate
+
+
+class HoldFrameFileWriter(SceneFileWriter):
+    """Converts each run of identical frames once (see the module docstring).
+
+    Set ``hold_frames`` to False on the writer to convert every frame, as
+    Manim does.
+    """
+
+    hold_frames = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Frames written to each partial movie in this run, by path
+        self.frame_counts = {}
+
+    def open_partial_movie_stream(self, file_path=None):
+        # Frames given to the encoder so far, which is also the next timestamp
+        self._next_pts = 0
+        self._held = None
+        self._held_planes = None
+        super().open_partial_movie_stream(file_path)
+
+    def encode_and_write_frame(self, frame, num_frames):
+        if not self.hold_frames or is_gif_format() or self.video_stream.pix_fmt != HELD_PIX_FMT:
+            super().encode_and_write_frame(frame, num_frames)
+            self._next_pts += num_frames
+            return
+        if self._held is None or not np.array_equal(frame, self._held):
+            av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+            converted = av_frame.reformat(
+                format=HELD_PIX_FMT, width=self.video_stream.width, height=self.video_stream.height
+            )
+            self._held_planes = converted.to_ndarray()
+            self._held = frame
+        for _ in range(num_frames):
+            # A new frame per copy, since the encoder may still hold the last one
+            av_frame = av.VideoFrame.from_ndarray(self._held_planes, format=HELD_PIX_FMT)
+            av_frame.pts = self._next_pts
+            for packet in self.video_stream.encode(av_frame):
+                self.video_container.mux(packet)
+            self._next_pts += 1
+
+    def close_partial_movie_stream(self):
+        super().close_partial_movie_stream()
+        self.frame_counts[str(self.partial_movie_file_path)] = self._next_pts
+
+    def is_already_cached(self, hash_invocation):
+        if not super().is_already_cached(hash_invocation):
+            return False
+        # Partial movies stored with one frame per hold by an earlier version
+        # of this writer do not concatenate; render those plays again
+        path = self.partial_movie_directory / f"{hash_invocation}{config['movie_file_extension']}"
+        return is_gif_format() or is_constant_rate(path, config.frame_rate)
+
+
+class AudioMuxFileWriter(HoldFrameFileWriter):
+    """Writes <Scene>_Audio.mp4 with the music bed muxed in while the partial
+    movies are concatenated, so the finished file is written only once.
+
+    Set ``audio`` (and optionally ``fade_duration``) on the writer once it is
+    installed; it is only read when the partial movies are combined.
+    """
+
+    audio = None
+    fade_duration = FADE_DURATION
+
+    def init_output_directories(self, scene_name):
+        super().init_output_directories(scene_name)
+        if hasattr(self, "movie_file_path"):
+            path = self.movie_file_path
+            self.movie_file_path = path.with_name(f"{path.stem}_Audio{path.suffix}")
+
+    def combine_to_movie(self):
+        partial_movie_files = [el for el in self.partial_movie_files if el is not None]
+        if self.audio is None or is_gif_format() or not partial_movie_files:
+            return super().combine_to_movie()
+        if self.includes_sound:
+            logger.warning("Scene adds its own sounds; muxing them instead of the music bed.")
+            return super().combine_to_movie()
+
+        # The fade goes at the known end of the scene, no probing needed
+        duration = partial_movies_duration(partial_movie_files, self.frame_counts)
+        bed_path = cached_audio_bed(self.audio, duration, self.fade_duration, fps=config.frame_rate)
+
+        file_list = self.partial_movie_directory / "partial_movie_file_list.txt"
+        with file_list.open("w", encoding="utf-8") as fp:
+            fp.write("# This file is used internally by FFMPEG.\n")
+            for pf_path in partial_movie_files:
+                fp.write(f"file 'file:{Path(pf_path).as_posix()}'\n")
+
+        logger.info("Combining to Movie file with audio.")
+        video_input = av.open(str(file_list), options={"safe": "0", "an": "1"}, format="concat")
+        with video_input, av.open(bed_path) as audio_input:
+            video_stream = video_input.streams.video[0]
+            audio_stream = audio_input.streams.audio[0]
+            output_container = av.open(str(self.movie_file_path), mode="w")
+            output_container.metadata["comment"] = f"Rendered with Manim Community v{__version__}"
+            output_video_stream = output_container.add_stream(template=video_stream)
+            output_audio_stream = output_container.add_stream(template=audio_stream)
+
+            for packet in video_input.demux(video_stream):
+                # Skip the flushing packets, and let libav recompute dts across files
+                if packet.dts is None:
+                    continue
+                packet.dts = None
+                packet.stream = output_video_stream
+                output_container.mux(packet)
+
+            for packet in audio_input.demux(audio_stream):
+                if packet.dts is None:
+                    continue
+                packet.stream = output_audio_stream
+                output_container.mux(packet)
+
+            output_container.close()
+
+        self.print_file_ready_message(str(self.movie_file_path))
+        for file_path in partial_movie_files:
+            modify_atime(file_path)
+
+
+class StreamingMixin:
+    """Also sends every frame to an HLS encoder as it is rendered (see
+    rendering.streaming).
+
+    Set ``stream_dir`` (and optionally ``stream_audio`` and
+    ``stream_duration``) on the writer once it is installed.
+    """
+
+    stream_dir = None
+    stream_audio = None
+    stream_duration = None
+    _stream = None
+
+    def _stream_frame(self, frame, num_frames=1):
+        if self.stream_dir is None:
+            return
+        if self._stream is None:
+            # Start from an empty directory, so players never pick up old segments
+            shutil.rmtree(self.stream_dir, ignore_errors=True)
+            os.makedirs(self.stream_dir)
+            cmd = hls_command(
+                self.stream_dir, config.pixel_width, config.pixel_height, config.frame_rate,
+                self.stream_audio, self.stream_duration
+            )
+            self._stream = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+            logger.info("Streaming to %(path)s", {"path": playlist_path(self.stream_dir)})
+        data = frame.tobytes()
+        for _ in range(num_frames):
+            self._stream.stdin.write(data)
+
+    def encode_and_write_frame(self, frame, num_frames):
+        super().encode_and_write_frame(frame, num_frames)
+        self._stream_frame(frame, num_frames)
+
+    def end_animation(self, allow_write=False):
+        super().end_animation(allow_write)
+        # Animations reused from the partial movie cache render no frames,
+        # so replay their partial movie into the stream instead
+        path = self.partial_movie_files[-1] if self.partial_movie_files else None
+        if self.stream_dir is not None and not allow_write and path is not None:
+            for pixels in decoded_frames(path, config.frame_rate):
+                self._stream_frame(pixels)
+
+    def finish(self):
+        if self._stream is not None:
+            self._stream.stdin.close()
+            if self._stream.wait() != 0:
+                logger.error("The HLS encoder exited with %(code)s", {"code": self._stream.returncode})
+        super().finish()
+
+
+class StreamingFileWriter(StreamingMixin, HoldFrameFileWriter):
+    """HoldFrameFileWriter with progressive HLS output."""
+
+
+class StreamingAudioMuxFileWriter(StreamingMixin, AudioMuxFileWriter):
+    """AudioMuxFileWriter with progressive HLS output."""